@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, TYPE_CHECKING
+from array import array
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
 import dice
@@ -24,34 +25,77 @@ MENTAL = (INT, WIS, CHR)
 ALL = PHYSICAL + MENTAL
 
 
+# The modifier of each stat value from 0 to 18.  Values above 18 have the same modifier as 18.
+_MODIFIERS = (-2,) * 4 + (-1,) * 4 + (0,) * 6 + (1,) * 4 + (2,)
+
+
 def modifier(val: int) -> int:
-    if val < 4:
-        return -2
-    elif val < 8:
-        return -1
-    elif val < 14:
-        return 0
-    elif val < 18:
-        return 1
-    else:
-        return 2
+    if 0 <= val < 19:
+        return _MODIFIERS[val]
+    return -2 if val < 0 else 2
 
 
 def best_modifier(vals: Iterable[int]) -> int:
     return max(map(modifier, vals))
 
 
-def roll() -> Dict[Stat, int]:
+# Index of each stat in a StatBlock.  Keyed by nick, as strings cache their hash and Stats don't.
+_INDEX = {stat.nick: index for index, stat in enumerate(ALL)}
+
+
+class StatBlock:
+    """The six stats of a creature, in a small array indexed by stat.
+
+    Reads and writes like a dict keyed by the Stat constants, such as `stats[STR]`.
+    """
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Optional[Mapping[Stat, int]] = None):
+        self._values = array("h", bytes(2 * len(ALL)))
+        if values:
+            for stat, value in values.items():
+                self[stat] = value
+
+    def __getitem__(self, stat: Stat) -> int:
+        return self._values[_INDEX[stat.nick]]
+
+    def __setitem__(self, stat: Stat, value: int) -> None:
+        self._values[_INDEX[stat.nick]] = value
+
+    def __iter__(self) -> Iterator[Stat]:
+        return iter(ALL)
+
+    def __len__(self) -> int:
+        return len(ALL)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StatBlock) and self._values == other._values
+
+    def __repr__(self) -> str:
+        return f"StatBlock({{{', '.join(f'{stat.nick}: {value}' for stat, value in self.items())}}})"
+
+    def items(self) -> Iterator[Tuple[Stat, int]]:
+        return zip(ALL, self._values)
+
+    def modifier(self, stat: Stat) -> int:
+        return modifier(self._values[_INDEX[stat.nick]])
+
+    def best_modifier(self, stats: Iterable[Stat]) -> int:
+        """Return the best modifier of the given stats, such as a weapon's attributes."""
+        return max(modifier(self._values[_INDEX[stat.nick]]) for stat in stats)
+
+
+def roll() -> StatBlock:
     strength = dice.roll(3, 6)
     dexterity = dice.roll(3, 6)
     constitution = dice.roll(3, 6)
     intelligence = dice.roll(3, 6)
     wisdom = dice.roll(3, 6)
     charisma = dice.roll(3, 6)
-    return {
+    return StatBlock({
         STR: strength, DEX: dexterity, CON: constitution, INT: intelligence, WIS: wisdom, CHR: charisma
-    }
+    })
 
 
-def typical() -> Dict[Stat, int]:
-    return {STR: 10, DEX: 10, CON: 10, INT: 10, WIS: 10, CHR: 10}
+def typical() -> StatBlock:
+    return StatBlock({STR: 10, DEX: 10, CON: 10, INT: 10, WIS: 10, CHR: 10})
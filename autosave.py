@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import time
+import traceback
+from typing import Optional, TYPE_CHECKING
+
+import save_format
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+class Autosaver:
+    """Saves the game every `interval` seconds without holding up the game.
+
+    A snapshot of the Engine is taken on the calling thread, then compressed and written on a
+    background thread.  Compression, file writes and hashing release the GIL, so the game keeps
+    running meanwhile.  `codec` and `level` choose the compression, see save_format.CODECS.
+    """
+
+    def __init__(self, path: str, interval: float = 60.0, codec: str = "lzma", level: Optional[int] = None):
+        self.path = path
+        self.interval = interval
+        self.codec = codec
+        self.level = level
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._pending: Optional[Future] = None
+        self._last_save = time.monotonic()
+
+    @property
+    def busy(self) -> bool:
+        """True while an autosave is being written."""
+        return self._pending is not None and not self._pending.done()
+
+    def update(self, engine: Engine) -> None:
+        """Start an autosave of `engine` if one is due and the previous one has finished."""
+        if self.busy or time.monotonic() - self._last_save < self.interval:
+            return
+        self.wait()
+        self._last_save = time.monotonic()
+        snapshot = save_format.Snapshot(engine, self.path)
+        self._pending = self._executor.submit(snapshot.write, self.codec, self.level)
+
+    def wait(self) -> None:
+        """Wait for the autosave being written, if any, reporting it if it failed."""
+        if self._pending is None:
+            return
+        try:
+            self._pending.result()
+        except Exception:
+            traceback.print_exc()  # The next save will try again.
+        self._pending = None
+
+    def save(self, engine: Engine) -> None:
+        """Save `engine` right away, once any autosave in progress is done."""
+        self.wait()
+        save_format.save(engine, self.path, self.codec, self.level)
+        self._last_save = time.monotonic()
+
+    def discard(self) -> None:
+        """Delete the save, once any autosave in progress is done."""
+        self.wait()
+        save_format.delete(self.path)
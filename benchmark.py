@@ -0,0 +1,268 @@
+"""Play the game without a window and report how fast it runs.
+
+Examples:
+    python benchmark.py --turns 2000 --seed 3
+    python benchmark.py --width 200 --height 120 --monster-density 3 --render --json
+    python benchmark.py --script moves.txt --trace-memory
+    python benchmark.py --entity-bytes
+
+A script has one action per line: `move DX DY`, `wait`, `pickup`, `down` or `up`.  Blank lines
+and lines starting with `#` are ignored.  Without a script the player heads for the nearest
+down stairs in view, and wanders at random when there are none.
+"""
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+import functools
+import json
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np  # type: ignore
+import tcod
+from tcod.console import Console
+
+import input_handlers  # Imported before the others to avoid a circular import.
+import actions
+from engine import Engine
+import entity_types
+from game_map import GameMap
+import procgen
+import setup_game
+import tile_types
+
+DIRECTIONS = [(-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+class PhaseTimer:
+    """Collects the time spent in instrumented functions, from any thread."""
+
+    def __init__(self) -> None:
+        self.times: Dict[str, List[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def instrument(self, owner: Any, name: str, phase: str) -> None:
+        """Replace `owner.name` with a wrapper which times every call as `phase`."""
+        function = getattr(owner, name)
+
+        @functools.wraps(function)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(phase, time.perf_counter() - start)
+
+        setattr(owner, name, timed)
+
+    def record(self, phase: str, seconds: float) -> None:
+        with self._lock:
+            self.times[phase].append(seconds)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                phase: {
+                    "calls": len(times),
+                    "total_ms": 1000 * sum(times),
+                    "mean_ms": 1000 * sum(times) / len(times),
+                    "max_ms": 1000 * max(times),
+                }
+                for phase, times in sorted(self.times.items())
+            }
+
+
+def read_script(filename: str) -> List[str]:
+    with open(filename, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+
+
+def scripted_actions(engine: Engine, script: List[str]) -> Iterator[actions.Action]:
+    for line in script:
+        command, *args = line.split()
+        player = engine.player
+        if command == "move":
+            yield actions.BumpAction(player, int(args[0]), int(args[1]))
+        elif command == "wait":
+            yield actions.WaitAction(player)
+        elif command == "pickup":
+            yield actions.PickupAction(player)
+        elif command in ("down", "up"):
+            yield actions.TakeStairsAction(player, down=command == "down")
+        else:
+            raise ValueError(f"Unknown script command {line!r}.")
+
+
+def random_actions(engine: Engine, rng: random.Random) -> Iterator[actions.Action]:
+    """Head down the nearest stairs in view, picking things up on the way."""
+    while True:
+        player = engine.player
+        game_map = engine.game_map
+        if game_map.tiles[player.x, player.y] == tile_types.down_stairs:
+            yield actions.TakeStairsAction(player, down=True)
+            continue
+        if game_map.get_items_at_location(player.x, player.y) and rng.random() < 0.5:
+            yield actions.PickupAction(player)
+            continue
+
+        stairs = np.argwhere((game_map.tiles == tile_types.down_stairs) & game_map.visible)
+        if len(stairs) and rng.random() < 0.9:
+            pathfinder = tcod.path.Pathfinder(
+                tcod.path.SimpleGraph(cost=game_map.compute_movement_cost(), cardinal=2, diagonal=3)
+            )
+            pathfinder.add_root((player.x, player.y))
+            target = min(stairs.tolist(), key=lambda xy: max(abs(xy[0] - player.x), abs(xy[1] - player.y)))
+            path = pathfinder.path_to(tuple(target))[1:].tolist()
+            if path:
+                yield actions.BumpAction(player, path[0][0] - player.x, path[0][1] - player.y)
+                continue
+        yield actions.BumpAction(player, *rng.choice(DIRECTIONS))
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    random.seed(args.seed)  # Combat rolls use the global generator.
+    rng = random.Random(args.seed)
+    if args.monster_density != 1:
+        procgen.max_monsters_by_floor = [
+            (floor, round(count * args.monster_density)) for floor, count in procgen.max_monsters_by_floor
+        ]
+
+    timer = PhaseTimer()
+    timer.instrument(Engine, "handle_enemy_turns", "enemy_turns")
+    timer.instrument(Engine, "update_fov", "update_fov")
+    timer.instrument(Engine, "render", "render")
+    timer.instrument(procgen, "generate_dungeon", "generate_dungeon")
+    timer.instrument(procgen, "generate_overland", "generate_overland")
+
+    if args.trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    engine = setup_game.new_game(args.width, args.height + 7, args.clairvoyant)
+    setup_seconds = time.perf_counter() - start
+    handler = input_handlers.MainGameEventHandler(engine)
+    console = Console(args.width, args.height + 7, order="F") if args.render else None
+
+    if args.script:
+        player_actions = scripted_actions(engine, read_script(args.script))
+    else:
+        player_actions = random_actions(engine, rng)
+
+    turns = 0
+    seconds = 0.0  # Spent by the game, leaving out choosing the player's actions.
+    start = time.perf_counter()
+    for action in player_actions:
+        if turns >= args.turns or not engine.player.is_alive:
+            break
+        turn_start = time.perf_counter()
+        if handler.handle_action(action):
+            turns += 1
+        if engine.player.level.requires_level_up:
+            engine.player.level.increase_max_hp()
+        if console is not None:
+            console.clear()
+            engine.render(console)
+        turn_seconds = time.perf_counter() - turn_start
+        timer.record("turn", turn_seconds)
+        seconds += turn_seconds
+    wall_seconds = time.perf_counter() - start
+
+    result = {
+        "turns": turns,
+        "seconds": seconds,
+        "wall_seconds": wall_seconds,
+        "turns_per_second": turns / seconds if seconds else 0.0,
+        "setup_seconds": setup_seconds,
+        "floor": engine.game_world.current_floor,
+        "player_alive": engine.player.is_alive,
+        "entities": len(engine.game_map.entities),
+        "phases": timer.report(),
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if args.trace_memory:
+        result["traced_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def entity_bytes(count: int = 2000) -> Dict[str, float]:
+    """Measure the memory taken by each spawned entity, with its components and the map's bookkeeping."""
+    engine = setup_game.new_game(80, 50, False)
+    spawners = {
+        "orc": entity_types.orc,  # With a war axe and leather armor in its inventory.
+        "bugbear": entity_types.bugbear,
+        "health_potion": entity_types.health_potion,
+        "dagger": entity_types.dagger,
+    }
+    result = {}
+    for name, spawner in spawners.items():
+        game_map = GameMap(engine, 80, 50)
+        tracemalloc.start()
+        for i in range(count):
+            spawner.spawn(game_map, i % 80, i // 80 % 50)
+        result[name] = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+    return result
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['turns']} turns in {result['seconds']:.2f}s: {result['turns_per_second']:.1f} turns/s"
+        f" (setup {result['setup_seconds']:.2f}s, {result['wall_seconds']:.2f}s including the player's choices)"
+    )
+    print(f"Ended on floor {result['floor']} with {result['entities']} entities,"
+          f" player {'alive' if result['player_alive'] else 'dead'}.")
+    print(f"{'phase':<20}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}")
+    for phase, stats in result["phases"].items():
+        print(
+            f"{phase:<20}{stats['calls']:>8}{stats['total_ms']:>12.1f}{stats['mean_ms']:>10.3f}{stats['max_ms']:>10.2f}"
+        )
+    print(f"Peak RSS: {result['max_rss_kib'] / 1024:.1f} MiB")
+    if "traced_peak_bytes" in result:
+        print(f"Peak traced memory: {result['traced_peak_bytes'] / 2**20:.1f} MiB")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=1000, help="Stop after this many player turns.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=132, help="Map width in tiles.")
+    parser.add_argument("--height", type=int, default=73, help="Map height in tiles.")
+    parser.add_argument("--monster-density", type=float, default=1.0,
+                        help="Multiplies the number of monsters per room.")
+    parser.add_argument("--clairvoyant", action="store_true", help="Play a clairvoyant, much tougher, player.")
+    parser.add_argument("--script", help="Play the actions in this file instead of random ones.")
+    parser.add_argument("--render", action="store_true", help="Also render every turn to an offscreen console.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Measure peak Python and NumPy memory with tracemalloc.  Slow.")
+    parser.add_argument("--entity-bytes", action="store_true",
+                        help="Only measure the memory taken by each spawned entity.")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.entity_bytes:
+        sizes = entity_bytes()
+        if args.json:
+            json.dump(sizes, sys.stdout, indent=1)
+            print()
+        else:
+            for name, size in sizes.items():
+                print(f"{name:<20}{size:>8.0f} bytes")
+        return
+
+    result = run(args)
+    if args.json:
+        json.dump(result, sys.stdout, indent=1)
+        print()
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
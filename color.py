@@ -17,6 +17,8 @@ steel = (0x71, 0x79, 0x7E)
 player_atk = (0xE0, 0xE0, 0xE0)
 enemy_atk = (0xFF, 0xC0, 0xC0)
 needs_target = (0x3F, 0xFF, 0xFF)
+blast_area = (0x60, 0x20, 0x10)
+blast_target = (0xC0, 0x30, 0x10)
 status_effect_applied = (0x3F, 0xFF, 0x3F)
 descend = (0x9F, 0x3F, 0xFF)
 
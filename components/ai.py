@@ -3,7 +3,6 @@ from __future__ import annotations
 import random
 from typing import List, Optional, Tuple, TYPE_CHECKING
 
-import numpy as np  # type: ignore
 import tcod
 
 from actions import Action, BumpAction, MeleeAction, MovementAction, WaitAction
@@ -25,17 +24,7 @@ class BaseAI(Action):
 
         If there is no valid path then returns an empty list.
         """
-        # Copy the walkable array.
-        cost = np.array(self.entity.parent.tiles["walkable"], dtype=np.int8)
-
-        for entity in self.entity.parent.entities:
-            # Check that an entity blocks movement and the cost isn't zero (blocking.)
-            if entity.blocks_movement and cost[entity.x, entity.y]:
-                # Add to the cost of a blocked position.
-                # A lower number means more enemies will crowd behind each other in
-                # hallways.  A higher number means enemies will take longer paths in
-                # order to surround the player.
-                cost[entity.x, entity.y] += 10
+        cost = self.entity.parent.movement_cost
 
         # Create a graph from the cost array and pass that graph to a new pathfinder.
         graph = tcod.path.SimpleGraph(cost=cost, cardinal=2, diagonal=3)
@@ -49,6 +38,13 @@ class BaseAI(Action):
         # Convert from List[List[int]] to List[Tuple[int, int]].
         return [(index[0], index[1]) for index in path]
 
+    def get_path_to_player(self) -> List[Tuple[int, int]]:
+        """Return a path to the player by walking down this turn's shared distance map.
+
+        If there is no valid path then returns an empty list.
+        """
+        return self.entity.parent.path_to_target(self.entity.x, self.entity.y)
+
 
 class QuestGiver(BaseAI):
     def __init__(self, entity: Actor):
@@ -74,7 +70,7 @@ class QuestGiver(BaseAI):
         if self.engine.game_map.visible[self.entity.x, self.entity.y]:
             if not self.path:
                 self.entity.person.say("Let me catch up!")
-            self.path = self.get_path_to(target.x, target.y)
+            self.path = self.get_path_to_player()
 
         if self.path and distance > 2:
             dest_x, dest_y = self.path.pop(0)
@@ -143,7 +139,7 @@ class HostileEnemy(BaseAI):
             if distance <= 1:
                 return MeleeAction(self.entity, dx, dy).perform()
 
-            self.path = self.get_path_to(target.x, target.y)
+            self.path = self.get_path_to_player()
 
         if self.path:
             dest_x, dest_y = self.path.pop(0)
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
+
+from entity import copy_slots
 
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
     from game_map import GameMap
 
+C = TypeVar("C", bound="BaseComponent")
+
 
 class BaseComponent:
+    __slots__ = ("parent",)
+
     parent: Entity  # Owning entity instance.
 
+    def __copy__(self: C) -> C:
+        return copy_slots(self)
+
     @property
     def game_map(self) -> GameMap:
         return self.parent.game_map
@@ -10,6 +10,8 @@ if TYPE_CHECKING:
 
 
 class Equipment(BaseComponent):
+    __slots__ = ("weapon", "armor", "shield")
+
     parent: Actor
 
     def __init__(self, weapon: Optional[Item] = None, armor: Optional[Item] = None, shield: Optional[Item] = None):
@@ -62,6 +64,7 @@ class Equipment(BaseComponent):
             self.unequip_from_slot(slot, add_message)
 
         setattr(self, slot, item)
+        self.parent.fighter.combat_stats_changed()
 
         if add_message:
             self.equip_message(item.name)
@@ -73,6 +76,7 @@ class Equipment(BaseComponent):
             self.unequip_message(current_item.name)
 
         setattr(self, slot, None)
+        self.parent.fighter.combat_stats_changed()
 
     def toggle_equip(self, equippable_item: Item, add_message: bool = True) -> None:
         if (
@@ -18,6 +18,8 @@ class Shock:
 
 
 class Equippable(BaseComponent):
+    __slots__ = ("equipment_type", "damage", "shock", "ac", "attribute")
+
     parent: Item
 
     def __init__(
@@ -36,51 +38,71 @@ class Equippable(BaseComponent):
 
 
 class Dagger(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.WEAPON, damage=(1, 4, 0), shock=Shock(1, 15))
 
 
 class ShortSword(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.WEAPON, damage=(1, 6, 0), shock=Shock(2, 15))
 
 
 class LongSword(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.WEAPON, damage=(1, 8, 0), shock=Shock(2, 13))
 
 
 class WarAxe(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.WEAPON, damage=(1, 10, 0), shock=Shock(3, 15),
                          attribute=(attributes.STR,))
 
 
 class WarShirt(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.ARMOR, ac=11)
 
 
 class Linothorax(Equippable):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(equipment_type=EquipmentType.ARMOR, ac=13)
 
 
 class WarRobe(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.ARMOR, ac=14)
 
 
 class MailHauberk(Equippable):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(equipment_type=EquipmentType.ARMOR, ac=16)
 
 
 class SmallShield(Equippable):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(equipment_type=EquipmentType.SHIELD, ac=13)
 
 
 class LargeShield(Equippable):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(equipment_type=EquipmentType.SHIELD, ac=14)
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
 from typing import Callable, Dict, List, Optional, TYPE_CHECKING
 
 import components.equippable
-from attributes import Stat, STR, DEX, best_modifier, modifier
+from attributes import DEX, StatBlock
 import color
 from components.base_component import BaseComponent
 from components.equippable import Equippable, EquipmentType
@@ -17,11 +18,26 @@ if TYPE_CHECKING:
 UNARMED = Equippable(equipment_type=EquipmentType.WEAPON)
 
 
+@dataclasses.dataclass(frozen=True)
+class CombatStats:
+    """A Fighter's combat values, derived from its equipment, stats, level, skills and abilities."""
+    ac: int
+    weapon_modifier: int
+    hit_roll_modifier: int
+    damage: tuple[int, int, int]
+    damage_bonus: int
+    shock_damage: int
+    max_shock_ac: int
+
+
 class Fighter(BaseComponent):
+    __slots__ = ("max_hp", "_hp", "stats", "base_ac", "base_damage", "base_damage_bonus", "skills", "on_die",
+                 "abilities", "_combat_stats")
+
     parent: Actor
 
     def __init__(self, hp: int,
-                 stats: Dict[Stat, int],
+                 stats: StatBlock,
                  base_ac: int = 10,
                  base_damage: tuple[int, int, int] = (1, 2, 0),
                  base_damage_bonus: int = 0,
@@ -39,6 +55,19 @@ class Fighter(BaseComponent):
         for skill, level in skills:
             self.skills[skill] = level
         self.abilities: List[abilities.Ability] = []
+        self._combat_stats: Optional[CombatStats] = None
+
+    @property
+    def combat_stats(self) -> CombatStats:
+        """The combat values, computed on first use after combat_stats_changed."""
+        if self._combat_stats is None:
+            self._combat_stats = self._compute_combat_stats()
+        return self._combat_stats
+
+    def combat_stats_changed(self) -> None:
+        """Must be called after anything combat values derive from changes: equipment, base values,
+        stats, level, skills or abilities."""
+        self._combat_stats = None
 
     @property
     def hp(self) -> int:
@@ -47,11 +76,66 @@ class Fighter(BaseComponent):
     @hp.setter
     def hp(self, value: int) -> None:
         self._hp = max(0, min(value, self.max_hp))
+        self.parent.attributes_changed()
         if self._hp == 0 and self.parent.ai:
             self.die()
 
     @property
     def ac(self) -> int:
+        return self.combat_stats.ac
+
+    @property
+    def weapon_modifier(self) -> int:
+        return self.combat_stats.weapon_modifier
+
+    @property
+    def hit_roll_modifier(self) -> int:
+        return self.combat_stats.hit_roll_modifier
+
+    @property
+    def max_shock_ac(self) -> int:
+        return self.combat_stats.max_shock_ac
+
+    @property
+    def damage(self) -> tuple[int, int, int]:
+        return self.combat_stats.damage
+
+    @property
+    def shock_damage(self) -> int:
+        return self.combat_stats.shock_damage
+
+    @property
+    def damage_bonus(self) -> int:
+        return self.combat_stats.damage_bonus
+
+    def _compute_combat_stats(self) -> CombatStats:
+        weapon = self.weapon
+        weapon_modifier = self.stats.best_modifier(weapon.attribute)
+
+        hit_roll_modifier = self.parent.level.actor_class.base_attack_bonus(self.parent)
+        if "stab" in self.skills:
+            hit_roll_modifier += self.skills["stab"]
+        hit_roll_modifier += weapon_modifier
+
+        damage_bonus = self.base_damage_bonus + weapon_modifier
+        for ability in self.abilities:
+            damage_bonus += ability.damage_bonus(self.parent)
+
+        s, d, b = self.base_damage
+        if self.parent.equipment.weapon is not None:
+            s, d, b = self.parent.equipment.weapon.equippable.damage
+
+        return CombatStats(
+            ac=self._compute_ac(),
+            weapon_modifier=weapon_modifier,
+            hit_roll_modifier=hit_roll_modifier,
+            damage=(s, d, b + damage_bonus),
+            damage_bonus=damage_bonus,
+            shock_damage=weapon.shock.damage + damage_bonus,
+            max_shock_ac=weapon.shock.max_ac,
+        )
+
+    def _compute_ac(self) -> int:
         eq = self.parent.equipment
         ac = self.base_ac
         if eq.armor is not None:
@@ -76,43 +160,9 @@ class Fighter(BaseComponent):
             return self.parent.equipment.shield.equippable
         return None
 
-    @property
-    def weapon_modifier(self) -> int:
-        return best_modifier(map(lambda att: self.stats[att], self.weapon.attribute))
-
-    @property
-    def hit_roll_modifier(self) -> int:
-        mod = self.parent.level.actor_class.base_attack_bonus(self.parent)
-        if "stab" in self.skills:
-            mod += self.skills["stab"]
-        mod += self.weapon_modifier
-        return mod
-
-    @property
-    def max_shock_ac(self) -> int:
-        return self.weapon.shock.max_ac
-
-    @property
-    def damage(self) -> tuple[int, int, int]:
-        s, d, b = self.base_damage
-        if self.parent.equipment.weapon is not None:
-            s, d, b = self.parent.equipment.weapon.equippable.damage
-        return s, d, b + self.damage_bonus
-
-    @property
-    def shock_damage(self) -> int:
-        return self.weapon.shock.damage + self.damage_bonus
-
     @property
     def ac_bonus(self) -> int:
-        return modifier(self.stats[DEX])
-
-    @property
-    def damage_bonus(self) -> int:
-        mod = self.base_damage_bonus + self.weapon_modifier
-        for ability in self.abilities:
-            mod += ability.damage_bonus(self.parent)
-        return mod
+        return self.stats.modifier(DEX)
 
     def heal(self, amount: int) -> int:
         if self.hp == self.max_hp:
@@ -151,3 +201,6 @@ class Fighter(BaseComponent):
         self.parent.render_order = RenderOrder.CORPSE
 
         self.engine.message_log.add_message(death_message, death_message_color)
+
+        if self.engine.player is not self.parent:
+            self.game_map.add_remains(self.parent)  # The player's body stays for the game over screen.
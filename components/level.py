@@ -30,6 +30,8 @@ class Monster(ActorClass):
 
 
 class Level(BaseComponent):
+    __slots__ = ("actor_class", "current_level", "current_xp", "level_up_base", "level_up_factor", "xp_given")
+
     parent: Actor
 
     def __init__(
@@ -74,6 +76,7 @@ class Level(BaseComponent):
         self.xp_given += 15
 
         self.current_level += 1
+        self.parent.fighter.combat_stats_changed()  # Also covers the stats raised before this is called.
 
     def increase_max_hp(self, amount: int = 20) -> None:
         self.parent.fighter.max_hp += amount
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+
+import numpy as np  # type: ignore
+
+import color
+
+if TYPE_CHECKING:
+    from tcod.console import Console
+
+
+# Graphics of one kind of decal.
+decal_dt = np.dtype(
+    [
+        ("ch", np.int32),
+        ("fg", "3B"),
+        ("lit_fg", "3B"),  # fg as seen on a lit tile.
+    ]
+)
+
+
+class DecalLayer:
+    """Static marks drawn over the tiles of a GameMap, such as the remains of the dead.
+
+    Each tile holds the ID of at most one decal in a small per-map palette, like the tiles
+    themselves, and a later decal on a tile replaces the earlier one.  The names of what lies
+    on each tile are kept for looking at it.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.ids = np.zeros((width, height), dtype=np.uint8, order="F")  # Zero for no decal.
+        self.palette = np.zeros(1, dtype=decal_dt)
+        self.names: Dict[Tuple[int, int], List[str]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Few tiles have decals, so only those are saved.
+        state = self.__dict__.copy()
+        x, y = np.nonzero(self.ids)
+        state["ids"] = self.ids.shape, x, y, self.ids[x, y]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        shape, x, y, ids = state["ids"]
+        state["ids"] = np.zeros(shape, dtype=ids.dtype, order="F")
+        state["ids"][x, y] = ids
+        self.__dict__.update(state)
+
+    def _id_of(self, ch: int, fg: Tuple[int, int, int]) -> int:
+        """Return the palette ID of a decal, adding it to the palette if it's new."""
+        matches = np.flatnonzero((self.palette["ch"] == ch) & (self.palette["fg"] == fg).all(axis=-1))
+        if len(matches):
+            return int(matches[0])
+        self.palette = np.append(self.palette, np.array((ch, fg, color.lit(fg)), dtype=decal_dt))
+        if len(self.palette) > np.iinfo(self.ids.dtype).max + 1:
+            self.ids = self.ids.astype(np.uint16, order="F")
+        return len(self.palette) - 1
+
+    def add(self, x: int, y: int, char: str, fg: Tuple[int, int, int], name: str) -> None:
+        self.ids[x, y] = self._id_of(ord(char), fg)
+        self.names.setdefault((x, y), []).append(name)
+
+    def scroll(self, dx: int, dy: int) -> None:
+        """Move the decals by (-dx, -dy), as the view moves by (dx, dy).  Those moved off the layer are dropped."""
+        width, height = self.ids.shape
+        ids = np.zeros_like(self.ids, order="F")
+        ids[max(0, -dx):width - max(0, dx), max(0, -dy):height - max(0, dy)] = (
+            self.ids[max(0, dx):width - max(0, -dx), max(0, dy):height - max(0, -dy)]
+        )
+        self.ids = ids
+        self.names = {
+            (x - dx, y - dy): names
+            for (x, y), names in self.names.items()
+            if 0 <= x - dx < width and 0 <= y - dy < height
+        }
+
+    def names_at(self, x: int, y: int) -> List[str]:
+        return self.names.get((x, y), [])
+
+    def render(self, console: Console, visible: np.ndarray, lit: np.ndarray) -> None:
+        """Draw the decals on visible tiles."""
+        x, y = np.nonzero((self.ids != 0) & visible)
+        graphics = self.palette[self.ids[x, y]]
+        console.ch[x, y] = graphics["ch"]
+        console.fg[x, y] = np.where(lit[x, y, np.newaxis], graphics["lit_fg"], graphics["fg"])
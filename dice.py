@@ -1,17 +1,20 @@
 import random
+from typing import Optional
 
 
-def roll(num_dice: int, num_sides: int, advantage: int = 0) -> int:
+def roll(num_dice: int, num_sides: int, advantage: int = 0, gen: Optional[random.Random] = None) -> int:
+    """Roll with `gen`, or the global generator when none is given."""
+    randint = random.randint if gen is None else gen.randint
     if num_sides == 1:
         return num_dice
 
     if advantage == 0:
         total = 0
         for die in range(num_dice):
-            total += random.randint(1, num_sides)
+            total += randint(1, num_sides)
         return total
 
-    rolls = sorted([random.randint(1, num_sides) for _ in range(num_dice + abs(advantage))])
+    rolls = sorted([randint(1, num_sides) for _ in range(num_dice + abs(advantage))])
     if advantage > 0:
         return sum(rolls[advantage:])
     else:
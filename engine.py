@@ -1,21 +1,25 @@
 from __future__ import annotations
 
-import lzma
 import math
-import pickle
 from typing import TYPE_CHECKING
+import uuid
 
+import numpy as np  # type: ignore
 from tcod.console import Console
 from tcod.map import compute_fov
 
 import exceptions
 from message_log import MessageLog
 import render_functions
+import save_format
 
 if TYPE_CHECKING:
     from entity import Actor
     from game_map import GameMap, GameWorld
 
+FOV_RADIUS = 12
+LIGHT_RADIUS = 2
+
 
 class Engine:
     game_map: GameMap
@@ -25,9 +29,12 @@ class Engine:
         self.message_log = MessageLog()
         self.mouse_location = (0, 0)
         self.player = player
+        self.game_id = uuid.uuid4().hex  # Tells saves of different games apart.
 
     def handle_enemy_turns(self) -> None:
-        for entity in set(self.game_map.actors) - {self.player}:
+        self.game_map.update_pathing(self.player.x, self.player.y)
+
+        for entity in self.game_map.actors - {self.player}:
             if entity.ai:
                 try:
                     entity.ai.perform()
@@ -36,10 +43,7 @@ class Engine:
 
     @property
     def player_world_location(self) -> tuple[float, float]:
-        oy, ox = self.game_world.offset
-        py, px = self.player.y, self.player.x
-        scale = self.game_world.scale
-        return ox + px * scale, oy + py * scale
+        return self.game_world.world_location(self.player.x, self.player.y)
 
     def render(self, console: Console):
         self.game_map.render(console)
@@ -56,76 +60,68 @@ class Engine:
         render_functions.render_names_at_mouse_location(console=console, x=21, y=self.game_map.height + 1, engine=self)
 
     def update_fov(self) -> None:
-        """Recompute the visible area based on the players point of view."""
+        """Recompute the visible area based on the players point of view.
+
+        Does nothing if neither the player nor the map's transparency changed since the last call.
+        """
+        game_map = self.game_map
+        lit_floor = self.game_world.current_floor > 0
+        fov_key = (self.player.x, self.player.y, self.player.clairvoyant, lit_floor, game_map.tiles_version)
+        if fov_key == game_map.fov_key:
+            return
+        game_map.fov_key = fov_key
+
+        # Forget the previous view, which never reaches outside of its window.
+        game_map.visible[game_map.fov_window] = False
+        game_map.lit[game_map.fov_window] = False
+        game_map.fov_changed(game_map.fov_window)
+
         if self.player.clairvoyant:
-            self.game_map.visible[:] = True
-            self.game_map.lit[:] = False
+            game_map.fov_window = (slice(None), slice(None))
+            game_map.visible[:] = True
         else:
-            self.game_map.visible[:] = compute_fov(
-                self.game_map.tiles["transparent"],
-                (self.player.x, self.player.y),
-                radius=12,
+            # Nothing past FOV_RADIUS can be seen, so only that window of the map is computed.
+            x, y = self.player.x, self.player.y
+            x0, x1 = max(0, x - FOV_RADIUS), min(game_map.width, x + FOV_RADIUS + 1)
+            y0, y1 = max(0, y - FOV_RADIUS), min(game_map.height, y + FOV_RADIUS + 1)
+            window = (slice(x0, x1), slice(y0, y1))
+            visible = compute_fov(
+                game_map.transparent[window],
+                (x - x0, y - y0),
+                radius=FOV_RADIUS,
             )
-            if self.game_world.current_floor > 0:
-                self.game_map.lit[:] = compute_fov(
-                    self.game_map.tiles["transparent"],
-                    (self.player.x, self.player.y),
-                    radius=2,
-                )
-            else:
-                self.game_map.lit[:] = False
-
-        self.game_map.explored |= self.game_map.visible
-
-    def save_as(self, filename: str):
-        """Save this Engine instance as a compressed file."""
-        save_data = lzma.compress(pickle.dumps(self))
-        with open(filename, "wb") as f:
-            f.write(save_data)
+            game_map.visible[window] = visible
+            if lit_floor:
+                # The lit area is the part of the same view within LIGHT_RADIUS (a square, like the FOV radius).
+                dx = np.abs(np.arange(x0, x1) - x)[:, np.newaxis]
+                dy = np.abs(np.arange(y0, y1) - y)[np.newaxis, :]
+                game_map.lit[window] = visible & (np.maximum(dx, dy) <= LIGHT_RADIUS)
+            game_map.fov_window = window
+
+        game_map.explored[game_map.fov_window] |= game_map.visible[game_map.fov_window]
+        game_map.fov_changed(game_map.fov_window)
+
+    def save_as(self, filename: str, codec: str = "lzma"):
+        """Save this Engine instance to a save directory, see save_format."""
+        save_format.save(self, filename, codec)
 
     def handle_exploration(self) -> None:
+        """Scroll the overland when the player reaches an edge of the map."""
         px = self.player.x
         py = self.player.y
-        shift = 5
-        dox, doy = 0, 0
-        move = False
-        isx = osx = slice(0, self.game_map.width)
-        isy = osy = slice(0, self.game_map.height)
+        shift = self.game_world.overland_scroll
+        dx, dy = 0, 0
 
         if px == 0:
-            dox = -shift * self.game_world.scale
-            px = shift
-            move = True
-            osx = slice(shift, self.game_map.width)
-            isx = slice(0, self.game_map.width - shift)
+            dx = -shift
         elif px == self.game_map.width - 1:
-            dox = shift * self.game_world.scale
-            px -= shift
-            move = True
-            osx = slice(0, self.game_map.width - shift)
-            isx = slice(shift, self.game_map.width)
+            dx = shift
 
         if py == 0:
-            doy = -shift * self.game_world.scale
-            py = shift
-            move = True
-            osy = slice(shift, self.game_map.height)
-            isy = slice(0, self.game_map.height - shift)
+            dy = -shift
         elif py == self.game_map.height - 1:
-            doy = shift * self.game_world.scale
-            py -= shift
-            move = True
-            osy = slice(0, self.game_map.height - shift)
-            isy = slice(shift, self.game_map.height)
-
-        if move:
-            oy, ox = self.game_world.offset
-            ox += dox
-            oy += doy
-            explored = self.game_map.explored[isx, isy]
-            self.game_world.offset = (oy, ox)
-            self.game_world.generate_overland()
-            self.game_map.explored[osx, osy] = explored
-            self.player.x = px
-            self.player.y = py
+            dy = shift
+
+        if dx or dy:
+            self.game_world.scroll_overland(dx, dy)
             self.update_fov()
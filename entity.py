@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import copy
+import functools
 import math
+import random
 from typing import Optional, Tuple, Type, TypeVar, TYPE_CHECKING, Union
 
 from render_order import RenderOrder
@@ -18,12 +20,35 @@ if TYPE_CHECKING:
     from game_map import GameMap
 
 T = TypeVar("T", bound="Entity")
+S = TypeVar("S")
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    return tuple(name for klass in cls.__mro__ for name in getattr(klass, "__slots__", ()))
+
+
+def copy_slots(obj: S) -> S:
+    """Return a shallow copy of a slotted object, several times faster than copy.copy."""
+    clone = object.__new__(type(obj))
+    for name in _slot_names(type(obj)):
+        try:
+            setattr(clone, name, getattr(obj, name))
+        except AttributeError:
+            pass  # Unset.
+    if hasattr(obj, "__dict__"):
+        clone.__dict__.update(obj.__dict__)
+    return clone
 
 
 class Entity:
     """
     A generic object to represent players, enemies, items, etc.
+
+    Entities and their components use __slots__ rather than a __dict__, as there can be
+    thousands of them on a floor.  Subclasses must declare __slots__ for their own attributes.
     """
+    __slots__ = ("x", "y", "_char", "_color", "name", "_blocks_movement", "_render_order", "parent")
 
     parent: Union[GameMap, Inventory]
 
@@ -39,42 +64,108 @@ class Entity:
                  ):
         self.x = x
         self.y = y
-        self.char = char
-        self.color = color
+        self._char = char
+        self._color = color
         self.name = name
-        self.blocks_movement = blocks_movement
-        self.render_order = render_order
+        self._blocks_movement = blocks_movement
+        self._render_order = render_order
         if parent:
             # If game_map isn't provided now then it will be set later.
             self.parent = parent
-            parent.entities.add(self)
+            parent.add_entity(self)
 
     @property
     def game_map(self) -> GameMap:
         return self.parent.game_map
 
+    @property
+    def char(self) -> str:
+        return self._char
+
+    @char.setter
+    def char(self, value: str) -> None:
+        self._char = value
+        self.attributes_changed()
+
+    @property
+    def color(self) -> Tuple[int, int, int]:
+        return self._color
+
+    @color.setter
+    def color(self, value: Tuple[int, int, int]) -> None:
+        self._color = value
+        self.attributes_changed()
+
+    @property
+    def blocks_movement(self) -> bool:
+        return self._blocks_movement
+
+    @blocks_movement.setter
+    def blocks_movement(self, value: bool) -> None:
+        self._blocks_movement = value
+        self.attributes_changed()
+
+    @property
+    def render_order(self) -> RenderOrder:
+        return self._render_order
+
+    @render_order.setter
+    def render_order(self, value: RenderOrder) -> None:
+        self._render_order = value
+        self.attributes_changed()
+
     @property
     def description(self) -> str:
         return self.name
 
-    def spawn(self: T, game_map: GameMap, x: int, y: int) -> T:
-        """Spawn a copy of this instance at the given location."""
+    def clone(self: T) -> T:
+        """Return a copy of this instance, not placed anywhere.
+
+        Subclasses share what they can with the copy, this makes a full copy.
+        """
         clone = copy.deepcopy(self)
+        if hasattr(clone, "parent"):
+            del clone.parent
+        return clone
+
+    def spawn(self: T, game_map: GameMap, x: int, y: int, gen: Optional[random.Random] = None) -> T:
+        """Spawn a copy of this instance at the given location.
+
+        Copies are exact, so nothing is rolled with `gen`.  It's taken like Spawner.spawn.
+        """
+        clone = self.clone()
         clone.x, clone.y = x, y
         clone.parent = game_map
-        game_map.entities.add(clone)
+        game_map.add_entity(clone)
         return clone
 
     def place(self, x: int, y: int, game_map: Optional[GameMap] = None) -> None:
         """Place this entity at a new location.  Handles moving across GameMaps."""
-        self.x = x
-        self.y = y
         if game_map:
             if hasattr(self, "parent"):  # Possibly uninitialized.
                 if self.parent is self.game_map:
-                    self.parent.entities.remove(self)
+                    self.parent.remove_entity(self)
+            self.x = x
+            self.y = y
             self.parent = game_map
-            game_map.entities.add(self)
+            game_map.add_entity(self)
+        else:
+            self.x = x
+            self.y = y
+            self._update_location_index()
+
+    def attributes_changed(self) -> None:
+        """Tell the GameMap holding this entity, if any, that attributes other than x and y changed.
+
+        Setting char, color, blocks_movement, render_order or an actor's ai or hp calls this.
+        """
+        if hasattr(self, "parent") and self.parent is self.game_map:
+            self.parent.entity_attributes_changed(self)
+
+    def _update_location_index(self) -> None:
+        """Tell the GameMap holding this entity, if any, that its location changed."""
+        if hasattr(self, "parent") and self.parent is self.game_map:
+            self.parent.update_entity_location(self)
 
     def distance(self, x: int, y: int) -> float:
         """
@@ -89,10 +180,11 @@ class Entity:
         # Move the entity by a given amount.
         self.x += dx
         self.y += dy
+        self._update_location_index()
 
 
 class Actor(Entity):
-    clairvoyant: bool = False
+    __slots__ = ("_ai", "equipment", "fighter", "inventory", "level", "person", "clairvoyant")
 
     def __init__(
             self,
@@ -119,7 +211,8 @@ class Actor(Entity):
             render_order=RenderOrder.ACTOR,
         )
 
-        self.ai: Optional[BaseAI] = ai_cls(self)
+        self.clairvoyant = False
+        self._ai: Optional[BaseAI] = ai_cls(self)
 
         self.equipment = equipment
         self.equipment.parent = self
@@ -137,6 +230,15 @@ class Actor(Entity):
         if self.person:
             self.person.parent = self
 
+    @property
+    def ai(self) -> Optional[BaseAI]:
+        return self._ai
+
+    @ai.setter
+    def ai(self, value: Optional[BaseAI]) -> None:
+        self._ai = value
+        self.attributes_changed()
+
     @property
     def is_alive(self) -> bool:
         """Returns True as long as this actor can perform actions."""
@@ -151,6 +253,8 @@ class Actor(Entity):
 
 
 class Item(Entity):
+    __slots__ = ("consumable", "equippable")
+
     def __init__(
             self, *,
             x: int = 0,
@@ -177,3 +281,17 @@ class Item(Entity):
         self.equippable = equippable
         if self.equippable:
             self.equippable.parent = self
+
+    def clone(self) -> Item:
+        """Return a new item like this one.
+
+        Items don't change once made, so the copy shares this item's name, colors and component
+        parameters.  Only the components themselves are new, as they refer back to their item.
+        """
+        return Item(
+            char=self.char,
+            color=self.color,
+            name=self.name,
+            consumable=copy.copy(self.consumable),
+            equippable=copy.copy(self.equippable),
+        )
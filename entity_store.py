@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np  # type: ignore
+
+import color
+from entity import Actor
+
+if TYPE_CHECKING:
+    from entity import Entity
+
+
+# One row of an EntityStore.
+entity_dt = np.dtype(
+    [
+        ("x", np.intp),
+        ("y", np.intp),
+        ("hp", np.int32),  # Zero for entities without a Fighter.
+        ("blocks_movement", bool),
+        ("render_order", np.int32),  # RenderOrder value.
+        ("alive", bool),  # A living actor.
+        ("ch", np.int32),
+        ("fg", "3B"),
+        ("lit_fg", "3B"),  # fg as seen on a lit tile.
+        ("used", bool),  # False for free rows.
+    ]
+)
+
+
+class EntityStore:
+    """The entities of a GameMap as columns of a NumPy array, one row per entity.
+
+    The columns mirror the entities' attributes, so questions about all of them can be asked
+    with array expressions instead of a loop.  The GameMap keeps them current as it's told
+    of changes, see GameMap.add_entity and Entity.attributes_changed, which the entities'
+    setters call.  Rows of removed entities are reused, so check the `used` column.
+    """
+
+    def __init__(self) -> None:
+        self.columns = np.zeros(16, dtype=entity_dt)
+        self.entities: List[Optional[Entity]] = []  # The entity of each row, None for free rows.
+        self._row_of: Dict[Entity, int] = {}
+        self._free_rows: List[int] = []
+        self._draw_order: Optional[np.ndarray] = None  # Used rows sorted by render order.
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self._row_of
+
+    def row(self, entity: Entity) -> int:
+        """Return the row of an entity in this store."""
+        return self._row_of[entity]
+
+    def add(self, entity: Entity) -> None:
+        """Give an entity a row, or refresh its row if it already has one."""
+        row = self._row_of.get(entity)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+                self.entities[row] = entity
+            else:
+                row = len(self.entities)
+                self.entities.append(entity)
+                if row == len(self.columns):
+                    self.columns = np.concatenate([self.columns, np.zeros_like(self.columns)])
+            self._row_of[entity] = row
+        self.update(entity)
+
+    def remove(self, entity: Entity) -> None:
+        row = self._row_of.pop(entity)
+        self.columns["used"][row] = False
+        self.entities[row] = None
+        self._free_rows.append(row)
+        self._draw_order = None
+
+    def update(self, entity: Entity) -> None:
+        """Copy all of an entity's attributes to its row."""
+        is_actor = isinstance(entity, Actor)
+        self.columns[self._row_of[entity]] = (
+            entity.x,
+            entity.y,
+            entity.fighter.hp if is_actor else 0,
+            entity.blocks_movement,
+            entity.render_order.value,
+            is_actor and entity.is_alive,
+            ord(entity.char),
+            entity.color,
+            color.lit(entity.color),
+            True,
+        )
+        self._draw_order = None
+
+    def update_location(self, entity: Entity) -> None:
+        row = self._row_of[entity]
+        self.columns["x"][row] = entity.x
+        self.columns["y"][row] = entity.y
+
+    def draw_order(self) -> np.ndarray:
+        """Return the used rows, sorted by render order."""
+        if self._draw_order is None:
+            used = np.flatnonzero(self.columns["used"])
+            self._draw_order = used[np.argsort(self.columns["render_order"][used], kind="stable")]
+        return self._draw_order
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import copy
 from dataclasses import dataclass
-from typing import Callable, Sequence, Type, TYPE_CHECKING
+import functools
+import random
+from typing import Callable, Optional, Sequence, Type, TYPE_CHECKING
 
 import attributes
 import color
@@ -23,7 +24,8 @@ if TYPE_CHECKING:
 
 
 class Spawner[T]:
-    def spawn(self, dungeon: GameMap, x: int, y: int):
+    def spawn(self, dungeon: GameMap, x: int, y: int, gen: Optional[random.Random] = None):
+        """Spawn a new entity at the given location, rolling anything random about it with `gen`."""
         raise NotImplementedError()
 
 
@@ -128,26 +130,37 @@ class MobSpawner(Spawner):
     base_damage: tuple[int, int, int] = (1, 2, 0)
     skills: tuple[tuple[str, int], ...] = ()
 
-    def spawn(self, dungeon: GameMap, x: int, y: int):
-        hp = dice.roll(self.hit_dice, 8)
+    # The stats every mob of this spawner starts with.  Each mob gets a copy, as stats can be raised.
+    @functools.cached_property
+    def stats(self) -> attributes.StatBlock:
+        return attributes.typical()
+
+    # Monster classes hold nothing that changes, so every mob of a spawner shares one.
+
+    @functools.cached_property
+    def actor_class(self) -> Monster:
+        return Monster(base_attack_bonus=self.base_attack_bonus)
+
+    def spawn(self, dungeon: GameMap, x: int, y: int, gen: Optional[random.Random] = None):
+        hp = dice.roll(self.hit_dice, 8, gen=gen)
         mob = Actor(char=self.char, color=self.color, name=self.name, ai_cls=self.ai_cls, equipment=Equipment(),
                     fighter=Fighter(hp=hp,
-                                    stats=attributes.typical(),
+                                    stats=attributes.StatBlock(self.stats),
                                     base_ac=self.base_ac,
                                     base_damage=self.base_damage,
                                     base_damage_bonus=self.base_damage_bonus,
                                     ),
                     inventory=Inventory(capacity=len(self.equipment)),
-                    level=Level(actor_class=Monster(base_attack_bonus=self.base_attack_bonus),
+                    level=Level(actor_class=self.actor_class,
                                 current_level=self.hit_dice, xp_given=self.hit_dice * 35))
         for item in self.equipment:
-            gear = copy.deepcopy(item)
+            gear = item.clone()
             gear.parent = mob.inventory
             mob.inventory.items.append(gear)
             mob.equipment.toggle_equip(gear, add_message=False)
         mob.x, mob.y = x, y
         mob.parent = dungeon
-        dungeon.entities.add(mob)
+        dungeon.add_entity(mob)
         return mob
 
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, Tuple
+
+import numpy as np  # type: ignore
+
+
+def pack_mask(mask: np.ndarray) -> np.ndarray:
+    """Return a boolean array packed to one bit per element, in Fortran order."""
+    return np.packbits(mask.ravel(order="F"))
+
+
+def unpack_mask(packed: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """Return the Fortran ordered boolean array of `shape` which pack_mask packed."""
+    return np.unpackbits(packed, count=shape[0] * shape[1]).view(bool).reshape(shape, order="F")
+
+
+class ExploredChunks:
+    """Which tiles of the overland the player has explored, in world tiles.
+
+    Kept as bit-packed square chunks, so an overland view can be scrolled away from or left
+    for a dungeon, and still show what was explored when it's back.  Chunks where nothing was
+    explored aren't kept at all.
+    """
+
+    def __init__(self, chunk_size: int = 32):
+        self.chunk_size = chunk_size
+        self._chunks: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def _overlaps(
+            self, x: int, y: int, width: int, height: int,
+    ) -> Iterator[Tuple[Tuple[int, int], Tuple[slice, slice], Tuple[slice, slice]]]:
+        """Yield the key of each chunk overlapping an area, with the overlap in the area and in the chunk."""
+        size = self.chunk_size
+        for chunk_x in range(x // size, (x + width - 1) // size + 1):
+            for chunk_y in range(y // size, (y + height - 1) // size + 1):
+                x0, x1 = max(x, chunk_x * size), min(x + width, (chunk_x + 1) * size)
+                y0, y1 = max(y, chunk_y * size), min(y + height, (chunk_y + 1) * size)
+                yield (
+                    (chunk_x, chunk_y),
+                    (slice(x0 - x, x1 - x), slice(y0 - y, y1 - y)),
+                    (slice(x0 - chunk_x * size, x1 - chunk_x * size), slice(y0 - chunk_y * size, y1 - chunk_y * size)),
+                )
+
+    def read(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Return which tiles of the given area were explored."""
+        explored = np.zeros((width, height), dtype=bool, order="F")
+        shape = (self.chunk_size, self.chunk_size)
+        for key, area, chunk in self._overlaps(x, y, width, height):
+            packed = self._chunks.get(key)
+            if packed is not None:
+                explored[area] = unpack_mask(packed, shape)[chunk]
+        return explored
+
+    def write(self, x: int, y: int, explored: np.ndarray) -> None:
+        """Remember which tiles of the area at (x, y) were explored, replacing what was known of it."""
+        width, height = explored.shape
+        shape = (self.chunk_size, self.chunk_size)
+        for key, area, chunk in self._overlaps(x, y, width, height):
+            packed = self._chunks.get(key)
+            tiles = np.zeros(shape, dtype=bool, order="F") if packed is None else unpack_mask(packed, shape)
+            tiles[chunk] = explored[area]
+            if tiles.any():
+                self._chunks[key] = pack_mask(tiles)
+            else:
+                self._chunks.pop(key, None)
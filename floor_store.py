@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import io
+import lzma
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Hashable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+
+class _FloorPickler(pickle.Pickler):
+    """Pickles a floor without the Engine it refers to."""
+
+    def __init__(self, file: io.BytesIO, engine: Engine):
+        super().__init__(file)
+        self.engine = engine
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        return "engine" if obj is self.engine else None
+
+
+class _FloorUnpickler(pickle.Unpickler):
+    """Reattaches an unpickled floor to the current Engine."""
+
+    def __init__(self, file: io.BytesIO, engine: Engine):
+        super().__init__(file)
+        self.engine = engine
+
+    def persistent_load(self, pid: Any) -> Engine:
+        if pid != "engine":
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}.")
+        return self.engine
+
+
+class FloorStore:
+    """Keeps the floors the player has left, so they can be returned to as they were.
+
+    The `max_in_memory` most recently left floors stay in memory.  Older ones are spilled to
+    compressed files in a temporary directory, and past `max_on_disk` the oldest are forgotten.
+    Spilled floors are read back into the pickle when the game is saved.
+    """
+
+    def __init__(self, engine: Engine, max_in_memory: int = 3, max_on_disk: int = 64):
+        self.engine = engine
+        self.max_in_memory = max_in_memory
+        self.max_on_disk = max_on_disk
+        self._in_memory: OrderedDict[Hashable, Any] = OrderedDict()
+        self._init_disk()
+
+    def _init_disk(self) -> None:
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._on_disk: OrderedDict[Hashable, str] = OrderedDict()
+        self._files_written = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for key in ("_directory", "_on_disk", "_files_written"):
+            del state[key]
+        spilled = {}
+        for key, path in self._on_disk.items():
+            with open(path, "rb") as f:
+                spilled[key] = f.read()
+        state["_spilled"] = spilled
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        spilled = state.pop("_spilled")
+        self.__dict__.update(state)
+        self._init_disk()
+        for key, data in spilled.items():
+            self._write(key, data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_memory or key in self._on_disk
+
+    def put(self, key: Hashable, floor: Any) -> None:
+        """Store a floor which the player has just left."""
+        self._in_memory[key] = floor
+        while len(self._in_memory) > self.max_in_memory:
+            old_key, old_floor = self._in_memory.popitem(last=False)
+            buffer = io.BytesIO()
+            _FloorPickler(buffer, self.engine).dump(old_floor)
+            self._write(old_key, lzma.compress(buffer.getvalue()))
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """Remove and return a stored floor, or return None if it isn't known."""
+        if key in self._in_memory:
+            return self._in_memory.pop(key)
+        path = self._on_disk.pop(key, None)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            data = lzma.decompress(f.read())
+        os.remove(path)
+        return _FloorUnpickler(io.BytesIO(data), self.engine).load()
+
+    def _write(self, key: Hashable, data: bytes) -> None:
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="floors-")
+        path = os.path.join(self._directory.name, f"{self._files_written}.floor.xz")
+        self._files_written += 1
+        with open(path, "wb") as f:
+            f.write(data)
+        self._on_disk[key] = path
+        while len(self._on_disk) > self.max_on_disk:
+            _, old_path = self._on_disk.popitem(last=False)
+            os.remove(old_path)
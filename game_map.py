@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, TYPE_CHECKING
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 
 import numpy as np  # type: ignore
+import tcod
 from tcod.console import Console
 
-import color
+from decals import DecalLayer
+from entity_store import EntityStore
+from exploration import ExploredChunks, pack_mask, unpack_mask
+from floor_store import FloorStore
+from prefetch import Prefetcher
 import worldgen.drama
 from entity import Actor, Item
 import tile_types
@@ -13,6 +18,16 @@ import tile_types
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
+    from procgen import OverlandChunks
+
+
+def _raw_records(array: np.ndarray) -> np.ndarray:
+    """View a structured array as raw bytes per record.
+
+    NumPy copies structured arrays field by field, which is many times slower than copying
+    the same records as opaque bytes.
+    """
+    return array.view(np.dtype((np.void, array.dtype.itemsize)))
 
 
 class GameMap:
@@ -21,8 +36,29 @@ class GameMap:
     ):
         self.engine = engine
         self.width, self.height = width, height
-        self.tiles = np.full((width, height), fill_value=tile_types.wall, order="F")
-        self.entities = set(entities)
+        self.tiles = np.full((width, height), fill_value=tile_types.wall, dtype=tile_types.tile_id_dt, order="F")
+        self.entities: Set[Entity] = set()
+
+        # Columns of entity attributes, kept current like the spatial index and by entity_attributes_changed.
+        self.entity_store = EntityStore()
+
+        # Spatial index of entities, kept current by add_entity, remove_entity and update_entity_location.
+        self._entity_locations: Dict[Entity, Tuple[int, int]] = {}
+        self._entities_by_location: Dict[Tuple[int, int], Set[Entity]] = {}
+
+        # Entities by kind, kept current by add_entity, remove_entity and entity_attributes_changed.
+        self._actors: Set[Actor] = set()  # Living actors.
+        self._items: Set[Item] = set()
+        self._corpses: Set[Actor] = set()
+
+        # Shared pathfinding data for the current turn, see update_pathing.
+        self._pathing_target: Optional[Tuple[int, int]] = None
+        self._movement_cost: Optional[np.ndarray] = None
+        self._player_distance: Optional[np.ndarray] = None
+        self._stale_distance: Set[Tuple[int, int]] = set()  # Tiles whose cost changed since _player_distance was built.
+
+        for entity in entities:
+            self.add_entity(entity)
 
         self.lit = np.full(
             (width, height), fill_value=False, order="F"
@@ -34,64 +70,351 @@ class GameMap:
             (width, height), fill_value=False, order="F"
         )  # Tiles the player has seen before
 
+        # The remains of dead actors, which leave the map's entities, see add_remains.
+        self.decals = DecalLayer(width, height)
+
+        # Bumped by tiles_changed whenever tiles are edited after generation.
+        self.tiles_version = 0
+        # Properties of every tile looked up from the palette, by name, and the tiles_version they're for.
+        self._tile_properties: Dict[str, Tuple[int, np.ndarray]] = {}
+
+        # What the current view was computed from and the area it covers, see Engine.update_fov.
+        self.fov_key: Optional[Tuple] = None
+        self.fov_window: Tuple[slice, slice] = (slice(None), slice(None))
+
+        # The floor number and where its stairs are, set by generate_dungeon.  The overland is floor 0.
+        self.floor = 0
+        self.upstairs_location: Optional[Tuple[int, int]] = None
+        self.downstairs_location: Optional[Tuple[int, int]] = None
+
+        # Tile graphics for render, composited for all tiles when tiles_version changes.
+        # Otherwise only the windows passed to fov_changed are composited again.
+        self._graphics: Optional[np.ndarray] = None
+        self._graphics_version = -1
+        self._dirty_windows: List[Tuple[slice, slice]] = []
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        # The tile graphics and properties are rebuilt on first use.
+        state["_tile_properties"] = {}
+        state["_graphics"] = None
+        state["_graphics_version"] = -1
+        state["_dirty_windows"] = []
+        # So is the pathfinding data, every turn.
+        state["_pathing_target"] = None
+        state["_movement_cost"] = None
+        state["_player_distance"] = None
+        state["_stale_distance"] = set()
+        # The masks are saved bit-packed, an eighth of their size.
+        for key in ("lit", "visible", "explored"):
+            state[key] = pack_mask(state[key])
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        for key in ("lit", "visible", "explored"):
+            setattr(self, key, unpack_mask(state[key], self.tiles.shape))
+
     @property
     def game_map(self) -> GameMap:
         return self
 
     @property
-    def actors(self) -> Iterator[Actor]:
-        """Iterate over this map's living actors."""
-        yield from (
-            entity
-            for entity in self.entities
-            if isinstance(entity, Actor) and entity.is_alive
-        )
+    def actors(self) -> AbstractSet[Actor]:
+        """This map's living actors.  Don't modify the map while iterating over them."""
+        return self._actors
+
+    @property
+    def items(self) -> AbstractSet[Item]:
+        """The items lying on this map.  Don't modify the map while iterating over them."""
+        return self._items
+
+    @property
+    def corpses(self) -> AbstractSet[Actor]:
+        """The dead actors still on this map, which is only the player, as others become decals.
+
+        Don't modify the map while iterating over them.
+        """
+        return self._corpses
+
+    def _kind_of(self, entity: Entity) -> Optional[Set[Any]]:
+        """Return the collection of entities by kind which `entity` belongs in, if any."""
+        if isinstance(entity, Actor):
+            return self._actors if entity.is_alive else self._corpses
+        if isinstance(entity, Item):
+            return self._items
+        return None
+
+    def tiles_changed(self) -> None:
+        """Must be called after tiles are modified, so cached views of them are refreshed."""
+        self.tiles_version += 1
 
     @property
-    def items(self) -> Iterator[Item]:
-        yield from (entity for entity in self.entities if isinstance(entity, Item))
+    def walkable(self) -> np.ndarray:
+        """Whether each tile can be walked on.  Don't modify, change tiles instead."""
+        return self._tile_property("walkable")
+
+    @property
+    def transparent(self) -> np.ndarray:
+        """Whether each tile can be seen through.  Don't modify, change tiles instead."""
+        return self._tile_property("transparent")
+
+    def _tile_property(self, name: str) -> np.ndarray:
+        version, values = self._tile_properties.get(name, (-1, None))
+        if version != self.tiles_version:
+            values = np.asfortranarray(tile_types.palette[name][self.tiles])
+            self._tile_properties[name] = self.tiles_version, values
+        return values
+
+    def fov_changed(self, window: Tuple[slice, slice]) -> None:
+        """Must be called after `lit`, `visible` or `explored` are modified within `window`."""
+        if self._graphics is None:
+            return  # All of it is composited on first use.
+        if len(self._dirty_windows) >= 8:
+            # Not rendered for a while, so composite all of it when it is.
+            self._graphics = None
+            self._dirty_windows.clear()
+            return
+        self._dirty_windows.append(window)
+
+    def add_entity(self, entity: Entity) -> None:
+        """Add an entity to this map at its current location."""
+        self.entities.add(entity)
+        self.entity_store.add(entity)
+        kind = self._kind_of(entity)
+        if kind is not None:
+            kind.add(entity)
+        self.update_entity_location(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        """Remove an entity from this map."""
+        self.entities.remove(entity)
+        location = self._entity_locations.pop(entity)
+        self._unindex(entity, location)
+        if self.entity_store.columns["blocks_movement"][self.entity_store.row(entity)]:
+            self._blockers_changed(location, -1)
+        self.entity_store.remove(entity)
+        for kind in (self._actors, self._items, self._corpses):
+            kind.discard(entity)  # type: ignore
+
+    def add_remains(self, actor: Actor) -> None:
+        """Replace a dead actor with a decal of its remains, dropping it from this map's entities."""
+        self.decals.add(actor.x, actor.y, actor.char, actor.color, actor.name)
+        self.remove_entity(actor)
+        del actor.parent
+
+    def entity_attributes_changed(self, entity: Entity) -> None:
+        """Update the entity store and kinds after any of an entity's attributes other than x and y changed."""
+        blocked = self.entity_store.columns["blocks_movement"][self.entity_store.row(entity)]
+        self.entity_store.update(entity)
+        if entity.blocks_movement != blocked:
+            self._blockers_changed(self._entity_locations[entity], 1 if entity.blocks_movement else -1)
+        if isinstance(entity, Actor):
+            if entity.is_alive:
+                self._corpses.discard(entity)
+                self._actors.add(entity)
+            else:
+                self._actors.discard(entity)
+                self._corpses.add(entity)
+
+    def update_entity_location(self, entity: Entity) -> None:
+        """Re-index an entity of this map after its x or y changed."""
+        location = entity.x, entity.y
+        old_location = self._entity_locations.get(entity)
+        if old_location == location:
+            return
+        if old_location is not None:
+            self._unindex(entity, old_location)
+        self._entity_locations[entity] = location
+        self._entities_by_location.setdefault(location, set()).add(entity)
+        self.entity_store.update_location(entity)
+        if self.entity_store.columns["blocks_movement"][self.entity_store.row(entity)]:
+            if old_location is not None:
+                self._blockers_changed(old_location, -1)
+            self._blockers_changed(location, 1)
+
+    def _unindex(self, entity: Entity, location: Tuple[int, int]) -> None:
+        entities_here = self._entities_by_location[location]
+        entities_here.discard(entity)
+        if not entities_here:
+            del self._entities_by_location[location]
+
+    def get_entities_at_location(self, x: int, y: int) -> AbstractSet[Entity]:
+        """Return the entities at the given location.  Don't modify the map while iterating over the result."""
+        return self._entities_by_location.get((x, y), frozenset())
+
+    def get_items_at_location(self, x: int, y: int) -> List[Item]:
+        return [entity for entity in self.get_entities_at_location(x, y) if isinstance(entity, Item)]
 
     def get_blocking_entity_at_location(
             self, location_x: int, location_y: int,
     ) -> Optional[Entity]:
-        for entity in self.entities:
-            if (
-                    entity.blocks_movement
-                    and entity.x == location_x
-                    and entity.y == location_y
-            ):
+        for entity in self.get_entities_at_location(location_x, location_y):
+            if entity.blocks_movement:
                 return entity
 
         return None
 
     def get_actor_at_location(self, x: int, y: int) -> Optional[Actor]:
-        for actor in self.actors:
-            if actor.x == x and actor.y == y:
-                return actor
+        for entity in self.get_entities_at_location(x, y):
+            if entity in self._actors:
+                return entity  # type: ignore
 
         return None
 
+    def blast_area(self, x: int, y: int, radius: int, *, line_of_effect: bool = False) -> np.ndarray:
+        """Return a mask of the tiles within `radius` of (x, y).
+
+        By default blasts reach through walls, like fireballs always have.  With
+        `line_of_effect` the area is limited to the tiles (x, y) can see, so walls stop it.
+        """
+        x0, x1 = max(0, x - radius), min(self.width, x + radius + 1)
+        y0, y1 = max(0, y - radius), min(self.height, y + radius + 1)
+        window = (slice(x0, x1), slice(y0, y1))
+        dx = np.arange(x0, x1)[:, np.newaxis] - x
+        dy = np.arange(y0, y1)[np.newaxis, :] - y
+        area = dx ** 2 + dy ** 2 <= radius ** 2  # As measured by Entity.distance.
+        if line_of_effect:
+            area &= tcod.map.compute_fov(self.transparent[window], (x - x0, y - y0), radius=radius)
+        mask = np.zeros((self.width, self.height), dtype=bool, order="F")
+        mask[window] = area
+        return mask
+
+    def actors_in_area(self, area: np.ndarray) -> List[Actor]:
+        """Return the living actors standing within a mask of tiles, such as from blast_area."""
+        columns = self.entity_store.columns
+        rows = np.flatnonzero(columns["used"] & columns["alive"])
+        rows = rows[area[columns["x"][rows], columns["y"][rows]]]
+        return [self.entity_store.entities[row] for row in rows.tolist()]  # type: ignore
+
+    def nearest_visible_actor(
+            self, x: int, y: int, max_distance: float, exclude: Optional[Entity] = None,
+    ) -> Optional[Actor]:
+        """Return the living actor in view nearest to (x, y), if any is closer than `max_distance`."""
+        columns = self.entity_store.columns
+        rows = np.flatnonzero(columns["used"] & columns["alive"])
+        rows = rows[self.visible[columns["x"][rows], columns["y"][rows]]]
+        if exclude is not None and exclude in self.entity_store:
+            rows = rows[rows != self.entity_store.row(exclude)]
+        distance_squared = (columns["x"][rows] - x) ** 2 + (columns["y"][rows] - y) ** 2
+        in_range = distance_squared < max_distance ** 2
+        if not in_range.any():
+            return None
+        nearest = rows[in_range][np.argmin(distance_squared[in_range])]
+        return self.entity_store.entities[nearest]  # type: ignore
+
+    def compute_movement_cost(self) -> np.ndarray:
+        """Return the cost of walking into each tile.  Zero means impassable."""
+        # Copy the walkable array.
+        cost = np.array(self.walkable, dtype=np.int8, order="F")
+
+        # Add to the cost of positions blocked by entities, unless they're impassable anyway.
+        # A lower number means more enemies will crowd behind each other in
+        # hallways.  A higher number means enemies will take longer paths in
+        # order to surround the player.
+        columns = self.entity_store.columns
+        blockers = columns[columns["used"] & columns["blocks_movement"]]
+        x, y = blockers["x"], blockers["y"]
+        np.add.at(cost, (x, y), np.where(cost[x, y], 10, 0).astype(np.int8))
+
+        return cost
+
+    def update_pathing(self, target_x: int, target_y: int) -> None:
+        """Start a new turn of pathfinding towards the target.
+
+        The cost grid and the Dijkstra map rooted at the target are built on first use, and
+        shared by every AI until the next call.  Blocking entities moving keep the cost grid
+        current, see path_to_target for the Dijkstra map.
+        """
+        self._pathing_target = target_x, target_y
+        self._movement_cost = None
+        self._player_distance = None
+        self._stale_distance.clear()
+
+    def _blockers_changed(self, location: Tuple[int, int], change: int) -> None:
+        """Keep this turn's cost grid current as a blocking entity enters (+1) or leaves (-1) a tile."""
+        cost = self._movement_cost
+        if cost is not None and cost[location]:
+            cost[location] += 10 * change
+            if self._player_distance is not None:
+                self._stale_distance.add(location)
+
+    @property
+    def movement_cost(self) -> np.ndarray:
+        """This turn's shared cost grid."""
+        if self._movement_cost is None:
+            self._movement_cost = self.compute_movement_cost()
+        return self._movement_cost
+
+    @property
+    def player_distance(self) -> np.ndarray:
+        """This turn's distance to the pathing target for every tile."""
+        if self._player_distance is None:
+            assert self._pathing_target is not None, "update_pathing must be called first."
+            distance = tcod.path.maxarray((self.width, self.height), dtype=np.int32, order="F")
+            distance[self._pathing_target] = 0
+            self._player_distance = tcod.path.dijkstra2d(
+                distance, self.movement_cost, cardinal=2, diagonal=3, out=distance
+            )
+            self._stale_distance.clear()
+        return self._player_distance
+
+    def path_to_target(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Return the path from (x, y) to the pathing target, without (x, y), or an empty list.
+
+        The path walks down player_distance.  That map isn't rebuilt for every entity which
+        moves during a turn, only when the first step of a path is onto a tile whose cost has
+        changed since.  So monsters acting later don't step into one which just moved, and
+        as monsters path again every turn, the rest of the path is corrected as they go.
+        """
+        for _ in range(2):
+            path: List[List[int]] = tcod.path.hillclimb2d(
+                self.player_distance, (x, y), cardinal=True, diagonal=True
+            )[1:].tolist()
+            if not path or tuple(path[0]) not in self._stale_distance:
+                break
+            self._player_distance = None
+        return [(step[0], step[1]) for step in path]
+
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
 
-    def render(self, console: Console) -> None:
-        console.rgb[0: self.width, 0: self.height] = np.select(
+    def tile_graphics(self, dtype: np.dtype = tile_types.graphic_dt) -> np.ndarray:
+        """Return the graphics of every tile as the player currently sees it.
 
-            condlist=[self.lit, self.visible, self.explored],
-            choicelist=[self.tiles["light"], self.tiles["dark"], self.tiles["oov"]],
-            default=tile_types.SHROUD,
-        )
+        Pass the dtype of the console the result is drawn on, so drawing it is a plain copy.
+        """
+        if self._graphics is None or self._graphics_version != self.tiles_version or self._graphics.dtype != dtype:
+            # Fortran order like the map and the console.
+            self._graphics = np.asfortranarray(self._composite_graphics((slice(None), slice(None)), dtype))
+            self._graphics_version = self.tiles_version
+        else:
+            for window in self._dirty_windows:
+                _raw_records(self._graphics[window])[...] = _raw_records(self._composite_graphics(window, dtype))
+        self._dirty_windows.clear()
+        return self._graphics
 
-        entities_sorted_for_rendering = sorted(
-            self.entities, key=lambda x: x.render_order.value
-        )
+    def _composite_graphics(self, window: Tuple[slice, slice], dtype: np.dtype) -> np.ndarray:
+        state = self.explored[window].astype(np.intp)
+        state[self.visible[window]] = 2
+        state[self.lit[window]] = 3
+        return _raw_records(tile_types.graphics_by_state(dtype))[state, self.tiles[window]].view(dtype)
+
+    def render(self, console: Console) -> None:
+        graphics = self.tile_graphics(console.rgb.dtype)
+        _raw_records(console.rgb[0: self.width, 0: self.height])[...] = _raw_records(graphics)
+        self.decals.render(console, self.visible, self.lit)
 
-        for entity in entities_sorted_for_rendering:
-            # Only print entities in the field of view.
-            x, y = entity.x, entity.y
-            if self.visible[x, y]:
-                fg = entity.color if not self.lit[x, y] else color.lit(entity.color)
-                console.print(x=x, y=y, string=entity.char, fg=fg)
+        # Draw the entities in view with one scatter, in render order.
+        rows = self.entity_store.columns[self.entity_store.draw_order()]
+        rows = rows[self.visible[rows["x"], rows["y"]]]
+        # Where entities share a tile only the last one drawn shows, and a scatter with repeated
+        # indices doesn't promise which value is kept.
+        _, last = np.unique((rows["x"] * self.height + rows["y"])[::-1], return_index=True)
+        rows = rows[len(rows) - 1 - last]
+        x, y = rows["x"], rows["y"]
+        console.ch[x, y] = rows["ch"]
+        console.fg[x, y] = np.where(self.lit[x, y, np.newaxis], rows["lit_fg"], rows["fg"])
 
 
 class GameWorld:
@@ -102,6 +425,9 @@ class GameWorld:
     # scale = .03125
     scale = 1/pow(2,7)
     seed = 42
+    overland_chunk_size = 32
+    overland_cache_bytes = 16 * 1024 * 1024
+    overland_scroll = 5  # Tiles the overland moves when the player reaches an edge.
 
     def __init__(
             self,
@@ -116,6 +442,12 @@ class GameWorld:
     ):
         self.engine = engine
         self.drama = None
+        self.overland: Optional[OverlandChunks] = None  # Created by generate_overland.
+        self.prefetcher = Prefetcher()
+        self.floors = FloorStore(engine)  # Floors the player has left, see generate_floor.
+        self.dungeon_entrance: Optional[Tuple[int, int]] = None  # World cell of the current dungeon's stairs.
+        # Overland tiles explored outside the current view, see scroll_overland and _replace_map.
+        self.explored_overland = ExploredChunks(self.overland_chunk_size)
 
         self.map_width = map_width
         self.map_height = map_height
@@ -127,22 +459,35 @@ class GameWorld:
 
         self.current_floor = current_floor
 
-    def generate_floor(self, coming_from_previous: bool) -> None:
-        from procgen import generate_dungeon
+    def world_location(self, x: int, y: int) -> Tuple[float, float]:
+        """Return the world location of a tile of the overland view."""
+        oy, ox = self.offset
+        return ox + x * self.scale, oy + y * self.scale
 
-        pwx, pwy = self.engine.player_world_location
-        seed = (
-                self.engine.game_world.seed
-                + self.current_floor * 83
+    def floor_seed(self, floor: int, location: Tuple[float, float]) -> int:
+        """Return the seed of a dungeon floor entered from the given world location."""
+        pwx, pwy = location
+        return (
+                self.seed
+                + floor * 83
                 + int(pwx) * 89
                 + int(pwy) * 97
         )
 
-        if self.current_floor == 1 and coming_from_previous:
-            self.drama = worldgen.drama.Drama(seed=seed)
-            self.drama.generate()
+    def build_floor(
+            self, floor: int, seed: int, coming_from_previous: bool, drama: Optional[worldgen.drama.Drama]
+    ) -> Tuple[GameMap, worldgen.drama.Drama]:
+        """Generate a dungeon floor and return it with the drama in effect on it.
 
-        self.engine.game_map = generate_dungeon(
+        Only reads from the world, so it's safe to run on a background thread.
+        """
+        from procgen import generate_dungeon
+
+        if floor == 1 and coming_from_previous:
+            drama = worldgen.drama.Drama(seed=seed)
+            drama.generate()
+
+        dungeon = generate_dungeon(
             max_rooms=self.max_rooms,
             room_min_size=self.room_min_size,
             room_max_size=self.room_max_size,
@@ -150,16 +495,170 @@ class GameWorld:
             map_height=self.map_height,
             engine=self.engine,
             seed=seed,
-            coming_from_previous=coming_from_previous,
+            floor=floor,
+            drama=drama,
         )
+        return dungeon, drama
+
+    def generate_floor(self, coming_from_previous: bool) -> None:
+        """Move the player to the current floor, returning them to it as they left it if it was visited before.
+
+        Floors are stored under the world cell of the dungeon's entrance, the same cell their
+        seeds are derived from, so every staircase leading to the same layout shares one dungeon.
+        """
+        location = self.engine.player_world_location
+        if self.current_floor == 1 and coming_from_previous:
+            self.dungeon_entrance = int(location[0]), int(location[1])
+
+        floor = self.floors.take((self.dungeon_entrance, self.current_floor))
+        if floor is None:
+            seed = self.floor_seed(self.current_floor, location)
+            floor = self.prefetcher.take((self.current_floor, seed, coming_from_previous))
+            if floor is None:
+                floor = self.build_floor(self.current_floor, seed, coming_from_previous, self.drama)
+        previous_drama = self.drama
+        dungeon, self.drama = floor
+
+        if coming_from_previous:
+            self.engine.player.place(*dungeon.upstairs_location, game_map=dungeon)
+        else:
+            self.engine.player.place(*dungeon.downstairs_location, game_map=dungeon)
+        self._replace_map(dungeon, previous_drama)
+
+    def _replace_map(self, game_map: GameMap, previous_drama: Optional[worldgen.drama.Drama]) -> None:
+        """Make `game_map` current, storing the dungeon floor or the exploration of the overland it replaces.
+
+        The player must already have been placed on the new map, so they aren't stored too.
+        """
+        previous_map = getattr(self.engine, "game_map", None)
+        self.engine.game_map = game_map
+        if previous_map is None:
+            return
+        if previous_map.floor > 0:
+            self.floors.put((self.dungeon_entrance, previous_map.floor), (previous_map, previous_drama))
+        else:
+            self.explored_overland.write(*self.overland_origin, previous_map.explored)
+
+    def prefetch(self) -> None:
+        """Start generating, in the background, what the player is likely to need next."""
+        if self.current_floor == 0:
+            self._prefetch_overland()
+        else:
+            self._prefetch_floors()
+
+    def _prefetch_floors(self) -> None:
+        game_map = self.engine.game_map
+        for floor, stairs, coming_from_previous in (
+                (self.current_floor + 1, game_map.downstairs_location, True),
+                (self.current_floor - 1, game_map.upstairs_location, False),
+        ):
+            if floor > 0 and stairs is not None and (self.dungeon_entrance, floor) not in self.floors:
+                seed = self.floor_seed(floor, self.world_location(*stairs))
+                self.prefetcher.submit(
+                    (floor, seed, coming_from_previous),
+                    self.build_floor, floor, seed, coming_from_previous, self.drama,
+                )
+
+    def _prefetch_overland(self) -> None:
+        game_map = self.engine.game_map
+        player = self.engine.player
+        width, height = game_map.width, game_map.height
+        origin_x, origin_y = self.overland_origin
+
+        # Warm the chunks beyond any edge the player is about to scroll past.
+        margin = 2 * self.overland_scroll
+        areas = []
+        if player.x < margin:
+            areas.append((origin_x - margin, origin_y - margin, margin, height + 2 * margin))
+        elif player.x >= width - margin:
+            areas.append((origin_x + width, origin_y - margin, margin, height + 2 * margin))
+        if player.y < margin:
+            areas.append((origin_x - margin, origin_y - margin, width + 2 * margin, margin))
+        elif player.y >= height - margin:
+            areas.append((origin_x - margin, origin_y + height, width + 2 * margin, margin))
+        for area in areas:
+            for chunk in self.overland.chunks_in(*area):
+                if not self.overland.is_cached(*chunk):
+                    self.prefetcher.warm(chunk, self.overland.chunk, *chunk)
+
+        # Generate the first floor under the nearest stairs in view.
+        window_x, window_y = game_map.fov_window
+        stairs = np.argwhere(
+            (game_map.tiles[game_map.fov_window] == tile_types.down_stairs) & game_map.visible[game_map.fov_window]
+        )
+        if len(stairs):
+            stairs += (window_x.start or 0, window_y.start or 0)
+            x, y = min(stairs.tolist(), key=lambda xy: max(abs(xy[0] - player.x), abs(xy[1] - player.y)))
+            wx, wy = self.world_location(x, y)
+            if ((int(wx), int(wy)), 1) in self.floors:
+                return
+            seed = self.floor_seed(1, (wx, wy))
+            self.prefetcher.submit((1, seed, True), self.build_floor, 1, seed, True, None)
+
+    @property
+    def overland_origin(self) -> Tuple[int, int]:
+        """The world tile at the top left corner of the overland view."""
+        oy, ox = self.offset
+        return round(ox / self.scale), round(oy / self.scale)
 
     def generate_overland(self) -> None:
-        from procgen import generate_overland
-        self.drama = None
-        self.engine.game_map = generate_overland(
+        from procgen import OverlandChunks, generate_overland
+        previous_drama, self.drama = self.drama, None
+        self.prefetcher.clear()  # Floors prefetched so far were made for the old drama.
+        if self.overland is None:
+            self.overland = OverlandChunks(
+                world_seed=self.seed,
+                scale=self.scale,
+                chunk_size=self.overland_chunk_size,
+                max_bytes=self.overland_cache_bytes,
+            )
+        overland = generate_overland(
             map_width=self.map_width,
             map_height=self.map_height,
             engine=self.engine,
-            offset=self.offset,
-            scale=self.scale,
+            origin=self.overland_origin,
+            chunks=self.overland,
         )
+        self._replace_map(overland, previous_drama)
+        overland.explored[...] = self.explored_overland.read(*self.overland_origin, self.map_width, self.map_height)
+
+    def scroll_overland(self, dx: int, dy: int) -> None:
+        """Move the overland view by the given number of tiles.
+
+        The tiles and exploration already on the map are shifted in place, and only the
+        newly revealed strips are read from the chunk cache and explored_overland.  Entities,
+        the player included, and decals move with the tiles.  Those moved off the map are dropped,
+        except for the player, who is kept at the edge.
+        """
+        game_map = self.engine.game_map
+        width, height = game_map.width, game_map.height
+        self.explored_overland.write(*self.overland_origin, game_map.explored)
+        oy, ox = self.offset
+        self.offset = (oy + dy * self.scale, ox + dx * self.scale)
+        origin_x, origin_y = self.overland_origin
+
+        destination = (slice(max(0, -dx), width - max(0, dx)), slice(max(0, -dy), height - max(0, dy)))
+        source = (slice(max(0, dx), width - max(0, -dx)), slice(max(0, dy), height - max(0, -dy)))
+        game_map.tiles[destination] = game_map.tiles[source]
+        game_map.explored[destination] = game_map.explored[source]
+
+        if dx:
+            strip = slice(width - dx, width) if dx > 0 else slice(0, -dx)
+            game_map.tiles[strip, :] = self.overland.read(origin_x + strip.start, origin_y, abs(dx), height)
+            game_map.explored[strip, :] = self.explored_overland.read(origin_x + strip.start, origin_y, abs(dx), height)
+        if dy:
+            strip = slice(height - dy, height) if dy > 0 else slice(0, -dy)
+            game_map.tiles[:, strip] = self.overland.read(origin_x, origin_y + strip.start, width, abs(dy))
+            game_map.explored[:, strip] = self.explored_overland.read(origin_x, origin_y + strip.start, width, abs(dy))
+
+        game_map.tiles_changed()
+
+        for entity in list(game_map.entities):
+            x, y = entity.x - dx, entity.y - dy
+            if game_map.in_bounds(x, y):
+                entity.place(x, y)
+            elif entity is self.engine.player:  # Only if the view moved by more than the player's distance to the edge.
+                entity.place(min(max(x, 0), width - 1), min(max(y, 0), height - 1))
+            else:
+                game_map.remove_entity(entity)
+        game_map.decals.scroll(dx, dy)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import os
 from typing import Callable, Optional, Tuple, TYPE_CHECKING, Union
 
 import tcod.event
@@ -159,11 +158,13 @@ class EventHandler(BaseEventHandler):
         self.engine.handle_enemy_turns()
 
         self.engine.update_fov()
+        self.engine.game_world.prefetch()
         return True
 
     def ev_mousemotion(self, event: tcod.event.MouseMotion) -> None:
-        if self.engine.game_map.in_bounds(event.position.x, event.position.y):
-            self.engine.mouse_location = event.position.x, event.position.y
+        location = event.position.x, event.position.y
+        if location != self.engine.mouse_location and self.engine.game_map.in_bounds(*location):
+            self.engine.mouse_location = location
 
     def on_render(self, console: tcod.console.Console) -> None:
         self.engine.render(console)
@@ -215,9 +216,7 @@ class MainGameEventHandler(EventHandler):
 class GameOverEventHandler(EventHandler):
     def on_quit(self) -> None:
         """Handle exiting out of a finished game."""
-        if os.path.exists("savegame.sav"):
-            os.remove("savegame.sav")  # Deletes the active save file.
-        raise exceptions.QuitWithoutSaving()  # Avoid saving a finished game.
+        raise exceptions.QuitWithoutSaving()  # Avoid saving a finished game, main deletes its save.
 
     def ev_quit(self, event: tcod.event.Quit) -> None:
         self.on_quit()
@@ -232,13 +231,18 @@ class HistoryViewer(EventHandler):
 
     def __init__(self, engine: Engine):
         super().__init__(engine)
-        self.log_length = len(engine.message_log.messages)
+        self.log_length = len(engine.message_log)
         self.cursor = self.log_length - 1
+        self.log_console: Optional[tcod.console.Console] = None  # Reused between renders.
 
     def on_render(self, console: tcod.console.Console) -> None:
         super().on_render(console)  # Draw the main state as the background.
 
-        log_console = tcod.console.Console(console.width - 6, console.height - 6)
+        log_console = self.log_console
+        if log_console is None or (log_console.width, log_console.height) != (console.width - 6, console.height - 6):
+            log_console = self.log_console = tcod.console.Console(console.width - 6, console.height - 6)
+        else:
+            log_console.clear()
 
         # Draw a frame with a custom banner title.
         log_console.draw_frame(0, 0, log_console.width, log_console.height)
@@ -247,13 +251,13 @@ class HistoryViewer(EventHandler):
         )
 
         # Render the message log using the cursor parameter.
-        self.engine.message_log.render_messages(
+        self.engine.message_log.render_range(
             log_console,
             1,
             1,
             log_console.width - 2,
             log_console.height - 2,
-            self.engine.message_log.messages[: self.cursor + 1],
+            self.cursor + 1,
         )
         log_console.blit(console, 3, 3)
 
@@ -512,20 +516,18 @@ class AreaRangedAttackHandler(SelectIndexHandler):
         self.callback = callback
 
     def on_render(self, console: tcod.Console) -> None:
-        """Highlight the tile under the cursor."""
+        """Highlight the area the blast would cover and the actors in view it would hit."""
         super().on_render(console)
 
         x, y = self.engine.mouse_location
-
-        # Draw a rectangle around the targeted area, so the player can see the affected tiles.
-        console.draw_frame(
-            x=x - self.radius - 1,
-            y=y - self.radius - 1,
-            width=self.radius ** 2,
-            height=self.radius ** 2,
-            fg=color.red,
-            clear=False,
-        )
+        game_map = self.engine.game_map
+        area = game_map.blast_area(x, y, self.radius) & game_map.explored
+        targets = game_map.actors_in_area(area & game_map.visible)
+        area[x, y] = False  # Leave the cursor as it is.
+        console.rgb["bg"][0: game_map.width, 0: game_map.height][area] = color.blast_area
+        for actor in targets:
+            if (actor.x, actor.y) != (x, y):
+                console.rgb["bg"][actor.x, actor.y] = color.blast_target
 
     def on_index_selected(self, x: int, y: int) -> Optional[Action]:
         return self.callback((x, y))
@@ -1,20 +1,64 @@
 import traceback
+from typing import Iterable, List, Optional, Tuple
 
 import tcod
 
+from autosave import Autosaver
 import color
 import exceptions
 import input_handlers
 import setup_game
 
 
-def save_game(handler: input_handlers.BaseEventHandler, filename: str) -> None:
+def save_game(handler: input_handlers.BaseEventHandler, autosaver: Autosaver) -> None:
     """If the current event handler has an active Engine then save it."""
     if isinstance(handler, input_handlers.EventHandler):
-        handler.engine.save_as(filename)
+        autosaver.save(handler.engine)
         print("Game saved.")
 
 
+def close_game(handler: input_handlers.BaseEventHandler) -> None:
+    """If the current event handler has an active Engine then close the files it holds open."""
+    if isinstance(handler, input_handlers.EventHandler):
+        handler.engine.message_log.close()
+
+
+def coalesce_events(events: Iterable[tcod.event.Event]) -> List[tcod.event.Event]:
+    """Drop the events of a batch which a neighbouring event makes redundant.
+
+    Of consecutive mouse motions only the last is kept, and key repeats of the key pressed just
+    before are dropped with their text input, so a held key doesn't queue up moves.
+    """
+    coalesced: List[tcod.event.Event] = []
+    last_key: Optional[tcod.event.KeyDown] = None
+    dropping_repeat = False
+    for event in events:
+        if isinstance(event, tcod.event.MouseMotion) and coalesced and isinstance(coalesced[-1], tcod.event.MouseMotion):
+            coalesced[-1] = event
+            continue
+        if isinstance(event, tcod.event.KeyDown):
+            dropping_repeat = (
+                event.repeat and last_key is not None and (event.sym, event.mod) == (last_key.sym, last_key.mod)
+            )
+            if dropping_repeat:
+                continue
+            last_key = event
+        elif isinstance(event, tcod.event.TextInput):
+            if dropping_repeat:
+                continue
+        else:
+            last_key = None
+            dropping_repeat = False
+        coalesced.append(event)
+    return coalesced
+
+
+def mouse_location(handler: input_handlers.BaseEventHandler) -> Optional[Tuple[int, int]]:
+    if isinstance(handler, input_handlers.EventHandler):
+        return handler.engine.mouse_location
+    return None
+
+
 def main() -> None:
     screen_width = 132
     screen_height = 80
@@ -26,6 +70,7 @@ def main() -> None:
     tile_set = tcod.tileset.load_bdf("data/14x14.bdf")
 
     handler: input_handlers.BaseEventHandler = setup_game.MainMenu(screen_width, screen_height)
+    autosaver = Autosaver("savegame.sav", interval=60.0, codec="lzma")
 
     with tcod.context.new_terminal(
         screen_width,
@@ -34,29 +79,48 @@ def main() -> None:
         title="Hard Times"
     ) as context:
         root_console = tcod.console.Console(screen_width, screen_height, order="F")
+        dirty = True  # Whether anything shown may have changed since the last frame.
         try:
             while True:
-                root_console.clear()
-                handler.on_render(console=root_console)
-                context.present(root_console)
+                if dirty:
+                    root_console.clear()
+                    handler.on_render(console=root_console)
+                    context.present(root_console)
+                    dirty = False
 
                 try:
-                    for event in tcod.event.wait():
-                        handler = handler.handle_event(context.convert_event(event))
+                    for event in coalesce_events(context.convert_event(event) for event in tcod.event.wait()):
+                        previous_handler, previous_mouse = handler, mouse_location(handler)
+                        handler = handler.handle_event(event)
+                        # Mouse motion only matters once it reaches another tile, and no handler reads text input.
+                        if (
+                                handler is not previous_handler
+                                or mouse_location(handler) != previous_mouse
+                                or not isinstance(event, (tcod.event.MouseMotion, tcod.event.TextInput))
+                        ):
+                            dirty = True
                 except Exception:  # Handle exceptions in game.
+                    dirty = True
                     traceback.print_exc()  # Print error to stderr.
                     # Then print the error to the message log.
                     if isinstance(handler, input_handlers.EventHandler):
                         handler.engine.message_log.add_message(
                             traceback.format_exc(), color.error
                         )
-        except exceptions.QuitWithoutSaving:
+
+                if isinstance(handler, input_handlers.EventHandler) and handler.engine.player.is_alive:
+                    autosaver.update(handler.engine)
+        except exceptions.QuitWithoutSaving:  # A finished game leaves no save behind.
+            close_game(handler)  # Its log reads files of the save.
+            autosaver.discard()
             raise
         except SystemExit:  # Save and quit.
-            save_game(handler, "savegame.sav")
+            save_game(handler, autosaver)
+            close_game(handler)
             raise
         except BaseException:  # Save on any other unexpected exception.
-            save_game(handler, "savegame.sav")
+            save_game(handler, autosaver)
+            close_game(handler)
             raise
 
 
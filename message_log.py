@@ -1,4 +1,13 @@
-from typing import Iterable, List, Reversible, Tuple
+from __future__ import annotations
+
+from array import array
+import bisect
+from collections import deque
+import functools
+import json
+import struct
+import tempfile
+from typing import Any, BinaryIO, Deque, Dict, Iterable, Iterator, List, Optional, Reversible, Tuple
 import textwrap
 
 import tcod
@@ -19,10 +28,158 @@ class Message:
             return f"{self.plain_text} (x{self.count})"
         return self.plain_text
 
+    def to_record(self) -> Dict[str, Any]:
+        return {"text": self.plain_text, "fg": self.fg, "count": self.count}
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> Message:
+        message = cls(record["text"], tuple(record["fg"]))
+        message.count = record["count"]
+        return message
+
+
+class MessageHistory:
+    """Older messages, in files.
+
+    Messages are stored as JSON lines, and an index file holds the offset of each line, so
+    any message can be read without reading the ones before it.  A history can start with
+    read-only segments in that layout, such as from a save, new messages are appended to
+    anonymous temporary files.
+    """
+    _offset = struct.Struct("<Q")
+
+    def __init__(self, segments: Iterable[Tuple[BinaryIO, BinaryIO, int]] = ()) -> None:
+        # Read-only segments as (data file, index file, message count), and the index of each one's first message.
+        self._segments: List[Tuple[BinaryIO, BinaryIO, int]] = list(segments)
+        self._segment_starts = [0]
+        for _, _, count in self._segments:
+            self._segment_starts.append(self._segment_starts[-1] + count)
+        self._base = self._segment_starts.pop()  # Messages in the segments.
+        self._data: Optional[BinaryIO] = None  # Temporary files, opened on the first append.
+        self._index: Optional[BinaryIO] = None
+        self._size = 0
+        self._count = self._base
+
+    def __len__(self) -> int:
+        return self._count
+
+    def truncate(self, count: int) -> None:
+        """Forget the messages from index `count` on.  Only messages of the segments can be forgotten."""
+        if self._count > self._base or count > self._base:
+            raise ValueError("Only messages of the segments can be forgotten.")
+        self._base = self._count = count
+
+    def append(self, message: Message) -> None:
+        if self._data is None or self._index is None:
+            self._data = tempfile.TemporaryFile()
+            self._index = tempfile.TemporaryFile()
+        line = json.dumps(message.to_record()).encode("utf-8") + b"\n"
+        self._data.seek(self._size)
+        self._data.write(line)
+        self._index.seek((self._count - self._base) * self._offset.size)
+        self._index.write(self._offset.pack(self._size))
+        self._size += len(line)
+        self._count += 1
+
+    def __getitem__(self, index: int) -> Message:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        if index < self._base:
+            segment = bisect.bisect_right(self._segment_starts, index) - 1
+            data, index_file, _ = self._segments[segment]
+            return self._read(data, index_file, index - self._segment_starts[segment])
+        return self._read(self._data, self._index, index - self._base)  # type: ignore
+
+    def close(self) -> None:
+        """Close the files of this history.  It can't be read or appended to after."""
+        for data, index_file, _ in self._segments:
+            data.close()
+            index_file.close()
+        if self._data is not None and self._index is not None:
+            self._data.close()
+            self._index.close()
+
+    def _read(self, data: BinaryIO, index_file: BinaryIO, index: int) -> Message:
+        index_file.seek(index * self._offset.size)
+        (offset,) = self._offset.unpack(index_file.read(self._offset.size))
+        data.seek(offset)
+        return Message.from_record(json.loads(data.readline()))
+
+
+class MessageRange:
+    """The messages of a log before `end`, read lazily."""
+
+    def __init__(self, log: MessageLog, end: int):
+        self.log = log
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end
+
+    def __iter__(self) -> Iterator[Message]:
+        for index in range(self.end):
+            yield self.log[index]
+
+    def __reversed__(self) -> Iterator[Message]:
+        for index in range(self.end - 1, -1, -1):
+            yield self.log[index]
+
 
 class MessageLog:
-    def __init__(self) -> None:
-        self.messages: List[Message] = []
+    """The game's messages.
+
+    Only the `max_recent` newest messages are kept in memory, older ones are moved to a
+    MessageHistory on disk.  Messages are indexed from the oldest, like a list.
+    """
+
+    def __init__(self, max_recent: int = 1000, history: Optional[MessageHistory] = None) -> None:
+        self.max_recent = max_recent
+        self.recent: Deque[Message] = deque()
+        self.history = MessageHistory() if history is None else history
+        self._line_offsets_by_width: Dict[int, array] = {}  # See _line_offsets.
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"max_recent": self.max_recent, "records": [message.to_record() for message in self.range(len(self))]}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["max_recent"])  # type: ignore
+        self.extend(Message.from_record(record) for record in state["records"])
+
+    @classmethod
+    def from_history(cls, history: MessageHistory, max_recent: int = 1000) -> MessageLog:
+        """Return a log of the messages of a history, reading only the recent ones into memory."""
+        log = cls(max_recent, history)
+        start = max(0, len(history) - max_recent)
+        log.recent.extend(history[index] for index in range(start, len(history)))
+        history.truncate(start)
+        return log
+
+    def close(self) -> None:
+        """Close the files of this log's history, once the log is no longer used."""
+        self.history.close()
+
+    def __len__(self) -> int:
+        return len(self.history) + len(self.recent)
+
+    def __getitem__(self, index: int) -> Message:
+        if index < 0:
+            index += len(self)
+        if index < len(self.history):
+            return self.history[index]
+        if index >= len(self):
+            raise IndexError(index)
+        return self.recent[index - len(self.history)]
+
+    def range(self, end: int) -> MessageRange:
+        """Return the messages before index `end`."""
+        return MessageRange(self, end)
+
+    def extend(self, messages: Iterable[Message]) -> None:
+        """Append messages as they are, without stacking them."""
+        for message in messages:
+            self.recent.append(message)
+            if len(self.recent) > self.max_recent:
+                self.history.append(self.recent.popleft())
 
     def add_message(
             self, text: str, fg: Tuple[int, int, int] = color.white, *, stack: bool = True,
@@ -32,10 +189,10 @@ class MessageLog:
         If `stack` is True then the message can stack with a previous message
         of the same text.
         """
-        if stack and self.messages and text == self.messages[-1].plain_text:
-            self.messages[-1].count += 1
+        if stack and self.recent and text == self.recent[-1].plain_text:
+            self.recent[-1].count += 1
         else:
-            self.messages.append(Message(text, fg))
+            self.extend([Message(text, fg)])
 
     def render(
             self, console: tcod.console.Console, x: int, y: int, width: int, height: int,
@@ -44,15 +201,55 @@ class MessageLog:
         `x`, `y`, `width`, `height` is the rectangular region to render onto
         the `console`.
         """
-        self.render_messages(console, x, y, width, height, self.messages)
+        self.render_messages(console, x, y, width, height, self.recent)
 
     @staticmethod
-    def wrap(string: str, width: int) -> Iterable[str]:
-        """Return a wrapped text message."""
-        for line in string.splitlines():  # Handle newlines in messages.
-            yield from textwrap.wrap(
-                line, width, expand_tabs=True,
-            )
+    @functools.lru_cache(maxsize=4096)
+    def wrap(string: str, width: int) -> Tuple[str, ...]:
+        """Return a wrapped text message.  Results are cached, as the same messages are drawn every frame."""
+        return tuple(
+            wrapped
+            for line in string.splitlines()  # Handle newlines in messages.
+            for wrapped in textwrap.wrap(line, width, expand_tabs=True)
+        )
+
+    def _line_offsets(self, width: int) -> array:
+        """Return the number of lines wrapped to `width` before each message but the last.
+
+        The offsets are kept between calls and only extended for new messages.  The last
+        message isn't included, as it can still stack.
+        """
+        offsets = self._line_offsets_by_width.setdefault(width, array("q", [0]))
+        for index in range(len(offsets) - 1, len(self) - 1):
+            offsets.append(offsets[-1] + len(self.wrap(self[index].full_text, width)))
+        return offsets
+
+    def render_range(
+            self, console: tcod.console.Console, x: int, y: int, width: int, height: int, end: int,
+    ) -> None:
+        """Render the messages before index `end`, the last one at the bottom of the area.
+
+        The line offsets find the first message on screen directly, so only the messages which
+        are shown are read and wrapped, however long the log is.
+        """
+        if end <= 0:
+            return
+        offsets = self._line_offsets(width)
+        if end < len(offsets):
+            bottom = offsets[end]
+        else:
+            bottom = offsets[-1] + len(self.wrap(self[end - 1].full_text, width))
+        top = max(0, bottom - height)
+        index = bisect.bisect_right(offsets, top) - 1
+        line = offsets[index]
+        row = y + height - (bottom - top)
+        for index in range(index, end):
+            message = self[index]
+            for text in self.wrap(message.full_text, width):
+                if line >= top:
+                    console.print(x=x, y=row, string=text, fg=message.fg)
+                    row += 1
+                line += 1
 
     @classmethod
     def render_messages(
@@ -71,7 +268,7 @@ class MessageLog:
         y_offset = height - 1
 
         for message in reversed(messages):
-            for line in reversed(list(cls.wrap(message.full_text, width))):
+            for line in reversed(cls.wrap(message.full_text, width)):
                 console.print(x=x, y=y + y_offset, string=line, fg=message.fg)
                 y_offset -= 1
                 if y_offset < 0:
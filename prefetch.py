@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class Prefetcher:
+    """Runs speculative generation jobs on background threads.
+
+    Results of `submit` are kept in a bounded cache until they are taken, the oldest being
+    dropped first.  Jobs must be deterministic, rolling with generators seeded from their
+    arguments rather than the global one, so that a prefetched result is exactly what
+    generating it on the spot would have produced.  Nothing is pickled except the settings.
+    """
+
+    def __init__(self, max_results: int = 8, workers: int = 1):
+        self.max_results = max_results
+        self.workers = workers
+        self._init_pool()
+
+    def _init_pool(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        self._results: OrderedDict[Hashable, Future] = OrderedDict()
+        self._warming: Dict[Hashable, Future] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"max_results": self.max_results, "workers": self.workers}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_pool()
+
+    def submit(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> None:
+        """Start computing `fn(*args)` for a later `take(key)`, unless it was already submitted."""
+        if key in self._results:
+            return
+        self._results[key] = self._executor.submit(fn, *args)
+        while len(self._results) > self.max_results:
+            _, dropped = self._results.popitem(last=False)
+            dropped.cancel()
+
+    def take(self, key: Hashable) -> Optional[Any]:
+        """Remove and return the result for `key`, waiting for it if it's still running.
+
+        Returns None if the key was never submitted, was dropped, or failed.  The caller should
+        then do the work itself, which will also report any error properly.
+        """
+        future = self._results.pop(key, None)
+        if future is None or future.cancelled():
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def warm(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> None:
+        """Run `fn(*args)` for its side effects, such as filling a cache, unless it's still running."""
+        future = self._warming.get(key)
+        if future is not None and not future.done():
+            return
+        if len(self._warming) >= 4 * self.max_results:
+            self._warming = {k: f for k, f in self._warming.items() if not f.done()}
+        self._warming[key] = self._executor.submit(fn, *args)
+
+    def clear(self) -> None:
+        """Drop every result which hasn't been taken."""
+        for future in self._results.values():
+            future.cancel()
+        self._results.clear()
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 import copy
+from dataclasses import dataclass
+import json
 import random
+import threading
 from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
 
+import numpy as np  # type: ignore
 import tcod
-from numpy import dtype, floating, ndarray
 
 import components.person
 from components.ai import QuestGiver
@@ -18,6 +22,7 @@ import worldgen.seed
 if TYPE_CHECKING:
     from engine import Engine
     from entity import Entity
+    from worldgen.drama import Drama
 
 max_items_by_floor = [
     (1, 2),
@@ -155,8 +160,8 @@ def place_entities(room: RectangularRoom, dungeon: GameMap, floor_number: int,
     for entity_type in monsters + items:
         x = entity_gen.randint(room.x1 + 1, room.x2 - 1)
         y = entity_gen.randint(room.y1 + 1, room.y2 - 1)
-        if not any(entity.x == x and entity.y == y for entity in dungeon.entities):
-            entity = entity_type.spawn(dungeon, x, y)
+        if not dungeon.get_entities_at_location(x, y):
+            entity = entity_type.spawn(dungeon, x, y, entity_gen)
 
 
 def make_room(dungeon: GameMap, node: tcod.bsp.BSP, node_rooms: Dict[tcod.bsp.BSP, RectangularRoom],
@@ -180,29 +185,137 @@ def make_room(dungeon: GameMap, node: tcod.bsp.BSP, node_rooms: Dict[tcod.bsp.BS
 
     # Dig out this room's inner area.
     dungeon.tiles[new_room.inner] = tile_types.floor
+    dungeon.tiles_changed()
 
     place_entities(new_room, dungeon, current_floor, room_gen)
 
     node_rooms[node] = new_room
 
 
-def terrain(e: floating) -> ndarray:
-    if e < 0.105:
-        return tile_types.deep_water
-    if e < 0.225:
-        return tile_types.shallow_water
-    elif e < 0.35:
-        return tile_types.beach
-    elif e < 0.5:
-        return tile_types.grassland
-    elif e < 0.65:
-        return tile_types.forest
-    elif e < 0.85:
-        return tile_types.desert
-    elif e < 0.93:
-        return tile_types.floor
-    else:
-        return tile_types.down_stairs
+@dataclass(frozen=True)
+class TerrainTable:
+    """Overland biome bands.  Noise below bounds[i] becomes tiles[i], anything higher becomes the last tile."""
+    bounds: np.ndarray
+    tiles: np.ndarray
+
+    @classmethod
+    def load(cls, filename: str) -> TerrainTable:
+        """Load a table from a JSON list of {"below": bound, "tile": name}, the last entry without a bound."""
+        with open(filename) as f:
+            bands = json.load(f)
+        return cls(
+            bounds=np.array([band["below"] for band in bands[:-1]], dtype=np.float64),
+            tiles=np.array([getattr(tile_types, band["tile"]) for band in bands], dtype=tile_types.tile_id_dt),
+        )
+
+    def classify(self, samples: np.ndarray) -> np.ndarray:
+        """Return the tile for every noise sample."""
+        return self.tiles[np.digitize(samples, self.bounds)]
+
+
+overland_terrain = TerrainTable.load("data/overland_terrain.json")
+
+
+class OverlandChunks:
+    """The overland terrain, generated lazily in square chunks and kept in an LRU cache.
+
+    Chunks are keyed by their position in world tiles divided by `chunk_size`.  The cache
+    is dropped when pickled since every chunk can be regenerated from the seed.  Chunks may
+    be generated from a background thread, see GameWorld.prefetch.
+    """
+
+    def __init__(
+            self,
+            world_seed: int,
+            scale: float,
+            chunk_size: int,
+            max_bytes: int,
+            terrain: TerrainTable = overland_terrain,
+    ):
+        # The same noise seed generate_overland has always drawn first from the world seed.
+        self.noise_seed = worldgen.seed.rand_seed(random.Random(world_seed))
+        self.scale = scale
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+        self.terrain = terrain
+        self._init_cache()
+
+    def _init_cache(self) -> None:
+        self._noise: Optional[tcod.noise.Noise] = None
+        self._chunks: OrderedDict[Tuple[int, int], np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()  # Guards the cache.
+        self._noise_lock = threading.Lock()  # Guards sampling.
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for key in ("_noise", "_chunks", "_bytes", "_lock", "_noise_lock"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_cache()
+
+    @property
+    def noise(self) -> tcod.noise.Noise:
+        if self._noise is None:
+            self._noise = tcod.noise.Noise(
+                dimensions=2,
+                algorithm=tcod.noise.Algorithm.SIMPLEX,
+                implementation=tcod.noise.Implementation.TURBULENCE,
+                seed=self.noise_seed,
+            )
+        return self._noise
+
+    def is_cached(self, chunk_x: int, chunk_y: int) -> bool:
+        return (chunk_x, chunk_y) in self._chunks
+
+    def chunks_in(self, x: int, y: int, width: int, height: int) -> Iterator[Tuple[int, int]]:
+        """Yield the keys of the chunks overlapping the given area, in world tiles."""
+        size = self.chunk_size
+        for chunk_x in range(x // size, (x + width - 1) // size + 1):
+            for chunk_y in range(y // size, (y + height - 1) // size + 1):
+                yield chunk_x, chunk_y
+
+    def chunk(self, chunk_x: int, chunk_y: int) -> np.ndarray:
+        """Return the tiles of a chunk, generating it if it isn't cached."""
+        key = chunk_x, chunk_y
+        with self._lock:
+            tiles = self._chunks.get(key)
+            if tiles is not None:
+                self._chunks.move_to_end(key)
+                return tiles
+
+        size = self.chunk_size
+        with self._noise_lock:
+            samples = 1 - self.noise[
+                tcod.noise.grid(shape=(size, size), scale=self.scale,
+                                origin=(chunk_y * size * self.scale, chunk_x * size * self.scale))
+            ]
+        tiles = self.terrain.classify(samples)
+
+        with self._lock:
+            if key not in self._chunks:
+                self._chunks[key] = tiles
+                self._bytes += tiles.nbytes
+            while self._bytes > self.max_bytes and len(self._chunks) > 1:
+                _, evicted = self._chunks.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return tiles
+
+    def read(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Return the tiles of the given area, in world tiles."""
+        size = self.chunk_size
+        tiles = np.empty((width, height), dtype=tile_types.tile_id_dt, order="F")
+        for chunk_x, chunk_y in self.chunks_in(x, y, width, height):
+            # The part of this chunk inside the area, in world tiles.
+            x0, x1 = max(x, chunk_x * size), min(x + width, (chunk_x + 1) * size)
+            y0, y1 = max(y, chunk_y * size), min(y + height, (chunk_y + 1) * size)
+            tiles[x0 - x:x1 - x, y0 - y:y1 - y] = self.chunk(chunk_x, chunk_y)[
+                x0 - chunk_x * size:x1 - chunk_x * size, y0 - chunk_y * size:y1 - chunk_y * size
+            ]
+        return tiles
 
 
 def connect_nodes(dungeon: GameMap, nodes: Tuple[tcod.bsp.BSP, tcod.bsp.BSP],
@@ -212,6 +325,7 @@ def connect_nodes(dungeon: GameMap, nodes: Tuple[tcod.bsp.BSP, tcod.bsp.BSP],
     centers = (node_rooms[child].center for child in nodes)
     for x, y in tunnel_between(gen, *centers):
         dungeon.tiles[x, y] = tile_types.floor
+    dungeon.tiles_changed()
 
 
 def generate_dungeon(
@@ -222,11 +336,16 @@ def generate_dungeon(
         map_height: int,
         engine: Engine,
         seed: int,
-        coming_from_previous: bool,
+        floor: int,
+        drama: Drama,
 ) -> GameMap:
-    """Generate a new dungeon map."""
-    player = engine.player
-    dungeon = GameMap(engine, map_width, map_height, entities=[player])
+    """Generate a new dungeon map.
+
+    The player isn't placed, so that floors can be generated ahead of time.  Put them on
+    `upstairs_location` or `downstairs_location` of the result.
+    """
+    dungeon = GameMap(engine, map_width, map_height)
+    dungeon.floor = floor
 
     bsp = tcod.bsp.BSP(x=0, y=0, width=dungeon.width, height=dungeon.height)
     bsp.split_recursive(
@@ -246,7 +365,7 @@ def generate_dungeon(
             connect_nodes(dungeon, node.children, node_rooms, gen)
             node_rooms[node] = node_rooms[node.children[0]]
         else:
-            make_room(dungeon, node, node_rooms, engine.game_world.current_floor, gen)
+            make_room(dungeon, node, node_rooms, floor, gen)
 
     # Add some extra tunnels to have a chance at making some shortcuts.
     nodes = list(node_rooms.keys())
@@ -259,17 +378,13 @@ def generate_dungeon(
     rooms = list(node_rooms.values())
     gen.shuffle(rooms)
 
-    if coming_from_previous:
-        player.place(*rooms[0].center, game_map=dungeon)
-    else:
-        player.place(*rooms[-1].center, game_map=dungeon)
-
-    dungeon.tiles[rooms[0].center] = tile_types.up_stairs
-    dungeon.tiles[rooms[-1].center] = tile_types.down_stairs
+    dungeon.upstairs_location = rooms[0].center
+    dungeon.downstairs_location = rooms[-1].center
+    dungeon.tiles[dungeon.upstairs_location] = tile_types.up_stairs
+    dungeon.tiles[dungeon.downstairs_location] = tile_types.down_stairs
+    dungeon.tiles_changed()
 
-    drama = engine.game_world.drama
-
-    if engine.game_world.current_floor == 1:
+    if floor == 1:
         person = components.person.Person(
             background=drama.props["main_role"]["background"],
             motivation=drama.props["main_role"]["motivation"],
@@ -281,17 +396,17 @@ def generate_dungeon(
             name=person.background.noun.capitalize(),
             hit_dice=10,
             ai_cls=QuestGiver,
-        ).spawn(dungeon, *rooms[-2].center)
+        ).spawn(dungeon, *rooms[-2].center, gen)
         quest_giver.person = person
         person.parent = quest_giver
 
-    if drama.props["antagonist"]["location"]["floor"] == engine.game_world.current_floor:
+    if drama.props["antagonist"]["location"]["floor"] == floor:
         if drama.props["antagonist"]["race"]["noun"] == "orc":
             quest_target_spawner = copy.deepcopy(entity_types.orc)
         else:
             raise NotImplementedError()
 
-        quest_target = quest_target_spawner.spawn(dungeon, *gen.choice(rooms).center)
+        quest_target = quest_target_spawner.spawn(dungeon, *gen.choice(rooms).center, gen)
         quest_target.fighter.on_die = quest_reward
         quest_target.color = (255, 255, 170)
         quest_target.name = "That ORC!"
@@ -310,25 +425,18 @@ def generate_overland(
         map_width: int,
         map_height: int,
         engine: Engine,
-        offset: tuple[int, int],
-        scale: float,
+        origin: Tuple[int, int],
+        chunks: OverlandChunks,
 ) -> GameMap:
+    """Generate the overland view whose top left corner is at `origin`, in world tiles."""
     player = engine.player
     dungeon = GameMap(engine, map_width, map_height, entities=[player])
 
     gen = random.Random(engine.game_world.seed)
+    worldgen.seed.rand_seed(gen)  # The terrain noise seed, see OverlandChunks.
 
-    noise = tcod.noise.Noise(
-        dimensions=2,
-        algorithm=tcod.noise.Algorithm.SIMPLEX,
-        implementation=tcod.noise.Implementation.TURBULENCE,
-        seed=worldgen.seed.rand_seed(gen),
-    )
-    samples = 1 - noise[tcod.noise.grid(shape=(map_height, map_width), scale=scale, origin=offset)]
-
-    for y in range(map_height):
-        for x in range(map_width):
-            dungeon.tiles[x, y] = terrain(samples[x, y])
+    dungeon.tiles[:] = chunks.read(*origin, map_width, map_height)
+    dungeon.tiles_changed()
 
     px = gen.randint(1, map_width - 2)
     py = gen.randint(1, map_height - 2)
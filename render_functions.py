@@ -15,7 +15,8 @@ def get_names_at_location(x: int, y: int, game_map: GameMap) -> str:
         return ""
 
     names = ", ".join(
-        entity.description for entity in game_map.entities if entity.x == x and entity.y == y
+        [entity.description for entity in game_map.get_entities_at_location(x, y)]
+        + game_map.decals.names_at(x, y)
     )
 
     return names.capitalize()
@@ -0,0 +1,293 @@
+"""Read and write saved games.
+
+A save is a directory of sections, tied together by a manifest which is written last:
+
+* ``arrays/``: NumPy arrays, such as map tiles, as ``.npy`` files named after their contents.
+  A save only writes arrays which changed, and a load memory-maps them.  Each array object
+  pickled gets its own entry in the manifest, so arrays which are equal but separate, such as
+  a new map's `visible` and `explored`, are loaded as separate arrays even if they share a file.
+* ``messages-<n>.jsonl``: segments of the message log, one message per line, each with a
+  ``messages-<n>.index`` of the offsets of its lines.  A save writes its new messages as a new
+  segment, merged with the newest segments when they aren't at least twice as long, so saves
+  mostly write only new messages and there are few segments.  Segments are never modified.
+  The last message, which may still stack, is kept in the manifest.
+* ``core-<n>.pickle.<codec>``: everything else, a compressed pickle which refers to the sections above.
+"""
+from __future__ import annotations
+
+import bz2
+import hashlib
+import io
+import json
+import lzma
+import os
+import pickle
+import shutil
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np  # type: ignore
+
+from message_log import Message, MessageHistory, MessageLog
+
+if TYPE_CHECKING:
+    from engine import Engine
+
+FORMAT = 3
+MANIFEST = "manifest.json"
+MESSAGES = "messages-{}"  # Segments of the message log, by generation.
+ARRAYS = "arrays"
+MIN_ARRAY_BYTES = 1024  # Smaller arrays are left in the core pickle.
+OFFSET_DT = np.dtype("<u8")  # Entries of a message segment's index.
+
+# Compression for the core pickle, as compress(data, level) and decompress(data).
+CODECS: Dict[str, Tuple[Callable[[bytes, Optional[int]], bytes], Callable[[bytes], bytes]]] = {
+    "lzma": (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+    "zlib": (lambda data, level: zlib.compress(data, -1 if level is None else level), zlib.decompress),
+    "bz2": (lambda data, level: bz2.compress(data, 9 if level is None else level), bz2.decompress),
+}
+
+
+def _replace_file(path: str, data: bytes) -> None:
+    """Write a file so that it is either left as it was or fully replaced."""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def _array_name(array: np.ndarray) -> str:
+    """Return the file name of an array, which depends only on its type, shape and contents."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((array.dtype.descr, array.shape, array.flags.f_contiguous)).encode())
+    digest.update(array.ravel(order="K").view(np.uint8))
+    return digest.hexdigest() + ".npy"
+
+
+class _SavePickler(pickle.Pickler):
+    """Pickles an Engine, setting aside copies of its large arrays and leaving out its message log."""
+
+    def __init__(self, file: io.BytesIO, engine: Engine):
+        super().__init__(file)
+        self.message_log = engine.message_log
+        self.arrays: List[np.ndarray] = []
+        self.array_ids: Dict[int, int] = {}  # Index in `arrays` by id() of the pickled array.
+        # The pickled arrays, so none is freed and its id() reused by another during the dump.
+        self._pickled_arrays: List[np.ndarray] = []
+
+    def persistent_id(self, obj: Any) -> Optional[Any]:
+        if obj is self.message_log:
+            return "message_log", obj.max_recent
+        if (
+                type(obj) is np.ndarray
+                and obj.nbytes >= MIN_ARRAY_BYTES
+                and not obj.dtype.hasobject
+                and (obj.flags.c_contiguous or obj.flags.f_contiguous)
+        ):
+            index = self.array_ids.get(id(obj))
+            if index is None:
+                index = self.array_ids[id(obj)] = len(self.arrays)
+                self.arrays.append(obj.copy(order="K"))
+                self._pickled_arrays.append(obj)
+            return "array", index
+        return None
+
+
+class _LoadUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, path: str, manifest: Dict[str, Any]):
+        super().__init__(file)
+        self.path = path
+        self.messages = manifest["messages"]
+        self.array_paths = [os.path.join(path, ARRAYS, name) for name in manifest["arrays"]]
+        self.arrays: Dict[int, np.ndarray] = {}
+
+    def persistent_load(self, pid: Any) -> Any:
+        kind, arg = pid
+        if kind == "message_log":
+            return _read_message_log(self.path, self.messages, arg)
+        if kind != "array":
+            raise pickle.UnpicklingError(f"Unknown persistent id {pid!r}.")
+        if arg not in self.arrays:
+            # Copy-on-write, so the game can modify the array without touching the file.  Entries
+            # which share a file are still mapped separately, as they were separate arrays.
+            array = np.load(self.array_paths[arg], mmap_mode="c", allow_pickle=False)
+            self.arrays[arg] = np.asarray(array)
+        return self.arrays[arg]
+
+
+def _read_manifest(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(
+            f"This save is from an older version of the game (format {manifest.get('format')!r}) and can't be loaded."
+        )
+    return manifest
+
+
+def _read_message_log(path: str, entry: Dict[str, Any], max_recent: int) -> MessageLog:
+    """Open the message log in place, reading only its recent messages.
+
+    The segment files are kept open, so older messages can still be read after a later save
+    replaces them, on systems which allow removing open files.
+    """
+    history = MessageHistory(
+        (
+            open(os.path.join(path, segment["name"] + ".jsonl"), "rb"),
+            open(os.path.join(path, segment["name"] + ".index"), "rb"),
+            segment["count"],
+        )
+        for segment in entry["segments"]
+    )
+    log = MessageLog.from_history(history, max_recent)
+    if entry["last"] is not None:
+        log.extend([Message.from_record(entry["last"])])
+    return log
+
+
+class Snapshot:
+    """Everything a save of an Engine will write, copied out of it.
+
+    Taking a snapshot only pickles the Engine and copies its large arrays, which is quick.
+    Hashing, compressing and writing the sections is left to `write`, which doesn't touch the
+    Engine, so it can run on another thread while the game goes on.  Only one snapshot of a
+    save may be taken or written at a time.
+    """
+
+    def __init__(self, engine: Engine, path: str):
+        self.path = path
+        self.game_id = engine.game_id
+        try:
+            self.previous: Optional[Dict[str, Any]] = _read_manifest(path)
+        except (OSError, ValueError):
+            self.previous = None
+
+        # The log file already holds the messages before this one, if it's the same game's.
+        self.message_start = 0
+        if self.previous is not None and self.previous["game"] == self.game_id:
+            self.message_start = sum(segment["count"] for segment in self.previous["messages"]["segments"])
+        log = engine.message_log
+        frozen = max(0, len(log) - 1)  # The last message can still stack, so it goes in the manifest.
+        if self.message_start > frozen:
+            self.message_start = 0
+        self.new_messages = [log[index].to_record() for index in range(self.message_start, frozen)]
+        self.last_message = log[-1].to_record() if len(log) else None
+
+        with io.BytesIO() as buffer:
+            pickler = _SavePickler(buffer, engine)
+            pickler.dump(engine)
+            self.core = buffer.getvalue()
+        self.arrays = pickler.arrays
+
+    def write(self, codec: str = "lzma", level: Optional[int] = None) -> None:
+        """Write this snapshot, rewriting only the sections which changed since the previous save."""
+        compress, _ = CODECS[codec]
+        path = self.path
+        if os.path.isfile(path):
+            os.remove(path)  # A save from before this format.
+        os.makedirs(os.path.join(path, ARRAYS), exist_ok=True)
+
+        array_names = []
+        for array in self.arrays:
+            name = _array_name(array)
+            array_names.append(name)
+            array_path = os.path.join(path, ARRAYS, name)
+            if not os.path.exists(array_path):
+                with io.BytesIO() as buffer:
+                    np.save(buffer, array, allow_pickle=False)
+                    _replace_file(array_path, buffer.getvalue())
+
+        generation = self.previous["generation"] + 1 if self.previous else 0
+        messages = self._write_messages(generation)
+
+        core = f"core-{generation}.pickle.{codec}"
+        _replace_file(os.path.join(path, core), compress(self.core, level))
+
+        manifest = {
+            "format": FORMAT,
+            "game": self.game_id,
+            "generation": generation,
+            "core": core,
+            "codec": codec,
+            "arrays": array_names,
+            "messages": messages,
+        }
+        _replace_file(os.path.join(path, MANIFEST), json.dumps(manifest, indent=1).encode("utf-8"))
+
+        # Only now is it safe to remove what the previous save used.
+        segments = {segment["name"] for segment in messages["segments"]}
+        stale = [
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.startswith("core-") and name != core
+            or name.startswith("messages") and name.rsplit(".", 1)[0] not in segments
+        ]
+        stale += [
+            os.path.join(path, ARRAYS, name)
+            for name in os.listdir(os.path.join(path, ARRAYS))
+            if name not in array_names
+        ]
+        for stale_path in stale:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass  # Still mapped by a loaded game on some systems, it'll be removed next time.
+
+    def _write_messages(self, generation: int) -> Dict[str, Any]:
+        """Write the new messages as a segment of the log and return its manifest entry."""
+        segments = list(self.previous["messages"]["segments"]) if self.message_start else []
+        merged: List[Dict[str, Any]] = []
+        count = len(self.new_messages)
+        while count and segments and segments[-1]["count"] <= 2 * count:
+            merged.insert(0, segments.pop())
+            count += merged[0]["count"]
+        if count:
+            name = MESSAGES.format(generation)
+            self._write_segment(name, merged)
+            segments.append({"name": name, "count": count})
+        return {"segments": segments, "last": self.last_message}
+
+    def _write_segment(self, name: str, merged: List[Dict[str, Any]]) -> None:
+        """Write a segment of the messages of the segments `merged`, then the new messages."""
+        data_path = os.path.join(self.path, name + ".jsonl")
+        index_path = os.path.join(self.path, name + ".index")
+        with open(data_path + ".tmp", "wb") as data, open(index_path + ".tmp", "wb") as index:
+            for segment in merged:
+                source = os.path.join(self.path, segment["name"])
+                offsets = np.fromfile(source + ".index", dtype=OFFSET_DT)
+                (offsets + data.tell()).astype(OFFSET_DT).tofile(index)
+                with open(source + ".jsonl", "rb") as f:
+                    shutil.copyfileobj(f, data)
+            offsets = []
+            for record in self.new_messages:
+                offsets.append(data.tell())
+                data.write(json.dumps(record).encode("utf-8") + b"\n")
+            np.array(offsets, dtype=OFFSET_DT).tofile(index)
+        os.replace(data_path + ".tmp", data_path)
+        os.replace(index_path + ".tmp", index_path)
+
+
+def save(engine: Engine, path: str, codec: str = "lzma", level: Optional[int] = None) -> None:
+    """Save an Engine to the directory at `path`."""
+    Snapshot(engine, path).write(codec, level)
+
+
+def load(path: str) -> Engine:
+    """Load an Engine from the directory at `path`."""
+    if os.path.isfile(path):
+        # The game's objects have changed too much since then for those saves to be played.
+        raise ValueError("This save is from an older version of the game and can't be loaded.")
+
+    manifest = _read_manifest(path)
+    _, decompress = CODECS[manifest["codec"]]
+    with open(os.path.join(path, manifest["core"]), "rb") as f:
+        data = decompress(f.read())
+    return _LoadUnpickler(io.BytesIO(data), path, manifest).load()
+
+
+def delete(path: str) -> None:
+    """Delete the save at `path`, if there is one."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
@@ -2,8 +2,6 @@
 from __future__ import annotations
 
 import copy
-import lzma
-import pickle
 import traceback
 from typing import Optional
 
@@ -17,6 +15,7 @@ from engine import Engine
 import entity_types
 from game_map import GameWorld
 import input_handlers
+import save_format
 
 
 # Load the background image and remove the alpha channel.
@@ -46,9 +45,10 @@ def new_game(screen_width: int, screen_height: int, clairvoyant: bool) -> Engine
         player.fighter.base_ac = 40
         player.fighter.base_damage_bonus = 12
         player.fighter.hp = 3000
+    player.fighter.combat_stats_changed()
 
-    dagger = copy.deepcopy(entity_types.dagger)
-    war_shirt = copy.deepcopy(entity_types.war_shirt)
+    dagger = entity_types.dagger.clone()
+    war_shirt = entity_types.war_shirt.clone()
 
     dagger.parent = player.inventory
     war_shirt.parent = player.inventory
@@ -80,9 +80,8 @@ def new_game(screen_width: int, screen_height: int, clairvoyant: bool) -> Engine
 
 
 def load_game(filename: str) -> Engine:
-    """Load an Engine instance from a file."""
-    with open(filename, "rb") as f:
-        engine = pickle.loads(lzma.decompress(f.read()))
+    """Load an Engine instance from a save directory."""
+    engine = save_format.load(filename)
     assert isinstance(engine, Engine)
     return engine
 
@@ -0,0 +1,21 @@
+import unittest
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+import attributes
+import entity_types
+import setup_game
+
+
+class MobSpawnerTest(unittest.TestCase):
+    def test_mobs_have_their_own_stats(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+        first = entity_types.goblin.spawn(engine.game_map, 1, 1)
+        second = entity_types.goblin.spawn(engine.game_map, 2, 1)
+        strength = second.fighter.stats[attributes.STR]
+        first.level.increase_power()
+        self.assertEqual(second.fighter.stats[attributes.STR], strength)
+        self.assertEqual(entity_types.goblin.spawn(engine.game_map, 3, 1).fighter.stats[attributes.STR], strength)
+
+
+if __name__ == "__main__":
+    unittest.main()
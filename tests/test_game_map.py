@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np  # type: ignore
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+import entity_types
+from entity_store import EntityStore
+from game_map import GameMap
+from render_order import RenderOrder
+import setup_game
+import tile_types
+
+
+class BlastAreaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+        self.game_map = GameMap(engine, 11, 11)
+        self.game_map.tiles[1:-1, 1:-1] = tile_types.floor
+        self.game_map.tiles[6, 1:-1] = tile_types.wall  # A wall between x=5 and x=7.
+        self.game_map.tiles_changed()
+
+    def test_blast_reaches_through_walls_by_default(self) -> None:
+        area = self.game_map.blast_area(5, 5, 3)
+        self.assertTrue(area[7, 5])
+        self.assertTrue(area[8, 5])
+        self.assertFalse(area[9, 5])  # Out of range.
+
+    def test_removed_actors_are_not_found(self) -> None:
+        orc = entity_types.orc.spawn(self.game_map, 4, 5)
+        self.game_map.remove_entity(orc)  # Its row is freed, not cleared.
+        self.game_map.visible[...] = True
+        self.assertEqual(self.game_map.actors_in_area(self.game_map.blast_area(5, 5, 3)), [])
+        self.assertIsNone(self.game_map.nearest_visible_actor(5, 5, 3))
+
+    def test_line_of_effect_stops_at_walls(self) -> None:
+        walled = self.game_map.blast_area(5, 5, 3, line_of_effect=True)
+        unwalled = self.game_map.blast_area(5, 5, 3)
+        self.assertTrue(walled[6, 5])  # The wall itself is hit.
+        self.assertFalse(walled[7:, :].any())
+        self.assertTrue((walled[:6] == unwalled[:6]).all())
+
+
+class EntityStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+        self.game_map = GameMap(engine, 11, 11)
+        self.game_map.tiles[1:-1, 1:-1] = tile_types.floor
+        self.game_map.tiles_changed()
+
+    def assertStoreCurrent(self) -> None:
+        store = self.game_map.entity_store
+        expected = EntityStore()
+        for entity in self.game_map.entities:
+            expected.add(entity)
+            self.assertEqual(store.columns[store.row(entity)], expected.columns[expected.row(entity)])
+        self.assertTrue(np.array_equal(self.game_map.movement_cost, self.game_map.compute_movement_cost()))
+
+    def test_attributes_write_through(self) -> None:
+        orc = entity_types.orc.spawn(self.game_map, 5, 5)
+        self.game_map.movement_cost  # Built before anything changes.
+        orc.char = "O"
+        orc.color = (1, 2, 3)
+        orc.blocks_movement = False
+        orc.render_order = RenderOrder.CORPSE
+        self.assertStoreCurrent()
+        orc.ai = None
+        self.assertStoreCurrent()
+        self.assertNotIn(orc, self.game_map.actors)
+        self.assertIn(orc, self.game_map.corpses)
+
+    def test_remains_leave_the_map(self) -> None:
+        orc = entity_types.orc.spawn(self.game_map, 5, 5)
+        orc.fighter.die()
+        self.assertNotIn(orc, self.game_map.entities)
+        self.assertEqual(self.game_map.decals.names_at(5, 5), [orc.name])
+        orc.fighter.hp = 0  # The store no longer has its row.
+        orc.char = "x"
+
+
+class TileGraphicsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+        self.game_map = GameMap(engine, 11, 11)
+        self.game_map.tiles[1:-1, 1:-1] = tile_types.floor
+        self.game_map.tiles_changed()
+
+    def test_unrendered_fov_changes_are_bounded(self) -> None:
+        for x in range(11):
+            self.game_map.fov_changed((slice(x, x + 1), slice(None)))
+        self.assertEqual(self.game_map._dirty_windows, [])  # Nothing composited yet.
+
+        self.game_map.tile_graphics()
+        for x in range(11):
+            self.game_map.visible[x, :] = True
+            self.game_map.fov_changed((slice(x, x + 1), slice(None)))
+            self.assertLessEqual(len(self.game_map._dirty_windows), 8)
+        expected = self.game_map._composite_graphics((slice(None), slice(None)), tile_types.graphic_dt)
+        self.assertTrue((self.game_map.tile_graphics() == expected).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
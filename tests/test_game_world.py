@@ -0,0 +1,42 @@
+import unittest
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+import entity_types
+import setup_game
+
+
+class ScrollOverlandTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = setup_game.new_game(80, 50, False)
+        self.game_world = self.engine.game_world
+        self.game_map = self.engine.game_map
+
+    def world_location(self, entity) -> tuple:
+        origin_x, origin_y = self.game_world.overland_origin
+        return origin_x + entity.x, origin_y + entity.y
+
+    def test_entities_and_decals_keep_their_world_location(self) -> None:
+        player = self.engine.player
+        player.place(self.game_map.width - 1, 4)  # Walking off the right edge scrolls by overland_scroll.
+        self.assertEqual(self.game_world.overland_scroll, 5)
+        potion = entity_types.health_potion.spawn(self.game_map, 6, 4)
+        lost = entity_types.health_potion.spawn(self.game_map, 2, 4)
+        orc = entity_types.orc.spawn(self.game_map, 7, 5)
+        orc.fighter.die()
+        locations = {entity: self.world_location(entity) for entity in (player, potion)}
+        tile = self.game_map.tiles[potion.x, potion.y]
+
+        self.engine.handle_exploration()
+
+        for entity, location in locations.items():
+            self.assertEqual(self.world_location(entity), location)
+        self.assertEqual(self.game_map.tiles[potion.x, potion.y], tile)
+        self.assertEqual(self.game_map.get_items_at_location(1, 4), [potion])
+        self.assertNotIn(lost, self.game_map.entities)
+        self.assertEqual(self.game_map.decals.names_at(2, 5), ["remains of Orc"])
+        self.assertTrue(self.game_map.decals.ids[2, 5])
+        self.assertFalse(self.game_map.decals.ids[7, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
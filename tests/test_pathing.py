@@ -0,0 +1,69 @@
+import pickle
+import unittest
+
+import numpy as np  # type: ignore
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+import entity_types
+from game_map import GameMap
+import setup_game
+import tile_types
+
+CORRIDOR = """
+##########
+#........#
+#.......@#
+#........#
+##########
+"""
+
+
+class SharedPathingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = setup_game.new_game(80, 50, False)
+        rows = CORRIDOR.strip().split("\n")
+        self.game_map = GameMap(self.engine, len(rows[0]), len(rows))
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row):
+                if char != "#":
+                    self.game_map.tiles[x, y] = tile_types.floor
+                if char == "@":
+                    self.engine.player.place(x, y, self.game_map)
+        self.game_map.tiles_changed()
+        self.game_map.visible[...] = True
+        self.engine.game_map = self.game_map
+
+    def test_monsters_path_around_one_which_just_moved(self) -> None:
+        first = entity_types.orc.spawn(self.game_map, 4, 2)
+        second = entity_types.orc.spawn(self.game_map, 4, 3)
+        self.game_map.update_pathing(self.engine.player.x, self.engine.player.y)
+        first.ai.perform()
+        self.assertEqual((first.x, first.y), (5, 2))
+        # The shortest step for the second orc is where the first one just moved to.
+        second.ai.perform()
+        self.assertEqual((second.x, second.y), (5, 3))
+        self.assertTrue(np.array_equal(self.game_map.movement_cost, self.game_map.compute_movement_cost()))
+
+    def test_cost_grid_follows_blockers(self) -> None:
+        self.game_map.update_pathing(self.engine.player.x, self.engine.player.y)
+        self.game_map.movement_cost  # Built before anything changes.
+        orc = entity_types.orc.spawn(self.game_map, 2, 2)
+        for change in (lambda: None, lambda: orc.move(1, 1), orc.fighter.die):
+            change()
+            self.assertTrue(np.array_equal(self.game_map.movement_cost, self.game_map.compute_movement_cost()))
+
+    def test_pathing_data_is_not_saved(self) -> None:
+        orc = entity_types.orc.spawn(self.game_map, 2, 2)
+        self.game_map.update_pathing(self.engine.player.x, self.engine.player.y)
+        orc.ai.perform()
+        game_map = pickle.loads(pickle.dumps(self.game_map))
+        self.assertIsNone(game_map._movement_cost)
+        self.assertIsNone(game_map._player_distance)
+        self.assertEqual(game_map._stale_distance, set())
+        for pathing_map in (game_map, self.game_map):
+            pathing_map.update_pathing(self.engine.player.x, self.engine.player.y)
+        self.assertTrue(np.array_equal(game_map.player_distance, self.game_map.player_distance))
+
+
+if __name__ == "__main__":
+    unittest.main()
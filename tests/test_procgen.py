@@ -0,0 +1,44 @@
+import random
+import unittest
+from unittest import mock
+
+import numpy as np  # type: ignore
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+import procgen
+import setup_game
+import tile_types
+
+
+class GenerateDungeonTest(unittest.TestCase):
+    def test_tile_properties_are_current_during_generation(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+        checked = []
+
+        def place_entities(room, dungeon, floor_number, gen) -> None:
+            # Spawn placement may look at walkable, which must include the room just dug.
+            expected = tile_types.palette["walkable"][dungeon.tiles]
+            self.assertTrue(np.array_equal(dungeon.walkable, expected))
+            checked.append(room)
+            real_place_entities(room, dungeon, floor_number, gen)
+
+        real_place_entities = procgen.place_entities
+        with mock.patch.object(procgen, "place_entities", place_entities):
+            dungeon, _ = engine.game_world.build_floor(1, 1234, True, None)
+        self.assertGreater(len(checked), 1)
+        self.assertTrue(np.array_equal(dungeon.walkable, tile_types.palette["walkable"][dungeon.tiles]))
+
+    def test_floors_depend_only_on_their_seed(self) -> None:
+        engine = setup_game.new_game(80, 50, False)
+
+        def mobs(global_seed: int) -> list:
+            random.seed(global_seed)  # As if the game had rolled differently before.
+            dungeon, _ = engine.game_world.build_floor(1, 1234, True, None)
+            return sorted((actor.x, actor.y, actor.name, actor.fighter.hp) for actor in dungeon.actors)
+
+        self.assertTrue(mobs(1))
+        self.assertEqual(mobs(1), mobs(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
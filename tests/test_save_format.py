@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np  # type: ignore
+
+import input_handlers  # noqa: F401  Imported before setup_game, which it imports.
+from message_log import Message
+import save_format
+import setup_game
+
+
+class SaveFormatTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "savegame.sav")
+        self.engine = setup_game.new_game(80, 50, False)
+        self.engine.update_fov()
+        self.addCleanup(self.engine.message_log.close)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def load(self):
+        engine = save_format.load(self.path)
+        self.addCleanup(engine.message_log.close)
+        return engine
+
+    def test_equal_arrays_load_separately(self) -> None:
+        game_map = self.engine.game_map
+        game_map.visible[...] = game_map.explored  # Equal contents, so the same array file.
+        save_format.save(self.engine, self.path, "zlib")
+        game_map = self.load().game_map
+        self.assertFalse(np.shares_memory(game_map.visible, game_map.explored))
+        game_map.visible[...] = True
+        self.assertFalse(game_map.explored.all())
+
+    def test_single_file_save_is_rejected(self) -> None:
+        with open(self.path, "wb") as f:  # Where saves from before the directory format were.
+            f.write(b"")
+        with self.assertRaisesRegex(ValueError, "older version"):
+            save_format.load(self.path)
+        save_format.save(self.engine, self.path, "zlib")  # A new game can still save over it.
+        self.assertEqual(self.load().game_id, self.engine.game_id)
+
+    def message_texts(self, engine) -> list:
+        log = engine.message_log
+        return [log[index].full_text for index in range(len(log))]
+
+    def test_message_log_over_many_saves(self) -> None:
+        for save in range(20):
+            for message in range(save % 4):
+                self.engine.message_log.add_message(f"Save {save} message {message}")
+            save_format.save(self.engine, self.path, "zlib")
+            self.assertEqual(self.message_texts(self.load()), self.message_texts(self.engine))
+        segments = save_format._read_manifest(self.path)["messages"]["segments"]
+        self.assertLessEqual(len(segments), 5)
+        files = [name for name in os.listdir(self.path) if name.startswith("messages")]
+        self.assertEqual(len(files), 2 * len(segments))
+
+    def test_load_reads_only_recent_messages(self) -> None:
+        for message in range(3 * self.engine.message_log.max_recent):
+            self.engine.message_log.add_message(f"Message {message}")
+        save_format.save(self.engine, self.path, "zlib")
+        expected = self.message_texts(self.engine)
+
+        with mock.patch.object(Message, "from_record", wraps=Message.from_record) as from_record:
+            loaded = self.load()
+        self.assertLessEqual(from_record.call_count, loaded.message_log.max_recent + 1)
+        self.assertEqual(self.message_texts(loaded), expected)
+
+        # A later save merges the segment the loaded log reads into a new one, and removes it.
+        segments = save_format._read_manifest(self.path)["messages"]["segments"]
+        for message in range(len(expected)):
+            loaded.message_log.add_message(f"Later message {message}")
+        save_format.save(loaded, self.path, "zlib")
+        self.assertFalse(os.path.exists(os.path.join(self.path, segments[0]["name"] + ".jsonl")))
+        self.assertEqual(self.message_texts(loaded)[:len(expected)], expected)
+        self.assertEqual(self.message_texts(self.load()), self.message_texts(loaded))
+
+    def test_closing_a_loaded_log_closes_its_files(self) -> None:
+        for message in range(2 * self.engine.message_log.max_recent):
+            self.engine.message_log.add_message(f"Message {message}")
+        save_format.save(self.engine, self.path, "zlib")
+        log = self.load().message_log
+        log.add_message("After loading")
+        files = [file for data, index, _ in log.history._segments for file in (data, index)]
+        self.assertTrue(files)
+        log.close()
+        self.assertTrue(all(file.closed for file in files))
+
+    def test_interrupted_save_leaves_previous_save(self) -> None:
+        save_format.save(self.engine, self.path, "zlib")
+        expected = self.message_texts(self.engine)
+
+        other = setup_game.new_game(80, 50, False)
+        self.addCleanup(other.message_log.close)
+        other.message_log.add_message("Another game")
+        real_replace_file = save_format._replace_file
+
+        def replace_file(path: str, data: bytes) -> None:
+            if path.endswith(save_format.MANIFEST):
+                raise OSError("Interrupted.")
+            real_replace_file(path, data)
+
+        with mock.patch.object(save_format, "_replace_file", replace_file):
+            with self.assertRaises(OSError):
+                save_format.save(other, self.path, "zlib")
+        self.assertEqual(self.message_texts(self.load()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
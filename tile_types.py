@@ -1,4 +1,5 @@
-from typing import Optional, Tuple
+import functools
+from typing import List, Optional, Tuple
 
 import numpy as np  # type: ignore
 
@@ -24,6 +25,12 @@ tile_dt = np.dtype(
     ]
 )
 
+# Maps hold tile IDs, which index the palette of tile types defined below.  New tile types must
+# be added after the others, as saved maps refer to them by ID.
+tile_id_dt = np.dtype(np.uint8)
+
+_palette: List[np.ndarray] = []
+
 
 def new_tile(
         *,
@@ -32,13 +39,14 @@ def new_tile(
         dark: Tuple[int, Tuple[int, int, int], Tuple[int, int, int]],
         light: Optional[Tuple[int, Tuple[int, int, int], Tuple[int, int, int]]] = None,
         oov: Optional[Tuple[int, Tuple[int, int, int], Tuple[int, int, int]]] = None,
-) -> np.ndarray:
-    """Helper function for defining individual tile types."""
+) -> int:
+    """Helper function for defining individual tile types.  Returns the ID of the new tile type."""
     if not light:
         light = (dark[0], color.lit(dark[1]), color.lit(dark[2]))
     if not oov:
         oov = (dark[0], color.invisible(dark[1]), color.invisible(dark[2]))
-    return np.array((walkable, transparent, dark, light, oov), dtype=tile_dt)
+    _palette.append(np.array((walkable, transparent, dark, light, oov), dtype=tile_dt))
+    return len(_palette) - 1
 
 
 # SHROUD represents unexplored, unseen tiles
@@ -47,7 +55,7 @@ SHROUD = np.array((ord(" "), (255, 255, 255), (32, 32, 0)), dtype=graphic_dt)
 floor = new_tile(
     walkable=True, transparent=True,
     dark=(ord("."), (75, 75, 82), (65, 65, 70)))
-floor_oov_bg: Tuple[int, int, int] = tuple(floor["oov"]["bg"])
+floor_oov_bg: Tuple[int, int, int] = tuple(_palette[floor]["oov"]["bg"])
 
 deep_water = new_tile(
     walkable=True, transparent=True,
@@ -86,3 +94,22 @@ up_stairs = new_tile(
     walkable=True, transparent=True,
     dark=(ord("<"), (75, 225, 75), (65, 65, 70)),
     oov=(ord("<"), (75, 225, 75), floor_oov_bg))
+
+# The tile_dt of every tile type, indexed by tile ID.
+palette = np.array(_palette, dtype=tile_dt)
+
+
+@functools.lru_cache(maxsize=None)
+def graphics_by_state(dtype: np.dtype = graphic_dt) -> np.ndarray:
+    """Return the graphic of every tile type in each visibility state, converted to `dtype`.
+
+    Indexed by [state, tile ID], where the states are unexplored, explored, visible then lit.
+    """
+    return np.stack(
+        [
+            np.broadcast_to(SHROUD, palette.shape),
+            palette["oov"],
+            palette["dark"],
+            palette["light"],
+        ]
+    ).astype(dtype)